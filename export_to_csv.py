@@ -7,50 +7,83 @@ These CSV files can then be uploaded to Snowflake using the upload_to_snowflake.
 """
 
 import os
-import glob
+import argparse
+import contextlib
+import functools
+import itertools
+import operator
 import sqlite3
-import pandas as pd
-from sqlalchemy import create_engine, inspect
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from urllib.parse import quote
 from dotenv import load_dotenv
 from tqdm import tqdm
+from sql_gen import generate_create_table_sql
 import logging
 import sys
 import time
 import csv
 import re
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("export.log"),
-        logging.StreamHandler(sys.stdout)
-    ]
-)
+# Optional: pyarrow is needed for Parquet output; together with ADBC it also
+# lets SQLite results be written to CSV/Parquet in bulk from C++
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pa_parquet
+except ImportError:
+    pa = None
+    pa_csv = None
+    pa_parquet = None
+
+try:
+    from adbc_driver_sqlite import dbapi as adbc_sqlite
+except ImportError:
+    adbc_sqlite = None
+
+def setup_logging():
+    """Configure logging; also used as the initializer for worker processes."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        datefmt='%Y-%m-%d %H:%M:%S',
+        handlers=[
+            logging.FileHandler("export.log"),
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+
 logger = logging.getLogger(__name__)
 
-# List of SQL reserved keywords that need special handling
-SQL_RESERVED_KEYWORDS = [
-    'ORDER', 'GROUP', 'TABLE', 'INDEX', 'SELECT', 'FROM', 'WHERE', 'JOIN',
-    'HAVING', 'WITH', 'OR', 'AND', 'NOT', 'NULL', 'TRUE', 'FALSE', 'DEFAULT',
-    'CREATE', 'ALTER', 'DROP', 'INSERT', 'UPDATE', 'DELETE', 'CASE', 'WHEN',
-    'THEN', 'ELSE', 'END', 'GRANT', 'REVOKE', 'COMMIT', 'ROLLBACK', 'NATURAL'
-]
-
-# Function to check if an identifier needs quoting in Snowflake
-def needs_quoting(identifier):
-    """Check if an identifier contains non-standard chars or is a reserved keyword."""
-    # Already quoted?
-    if identifier.startswith('"') and identifier.endswith('"'):
-        return False 
-    # Check for anything other than uppercase letters, numbers, underscores
-    if not re.match(r'^[A-Z_][A-Z0-9_]*$', identifier):
-        return True # Contains lowercase, spaces, hyphens, or other symbols
-    # Check if it's a reserved keyword
-    if identifier in SQL_RESERVED_KEYWORDS: # Keywords list is uppercase
-        return True
-    return False
+# Number of rows pulled from SQLite per fetchmany() call while writing Parquet
+EXPORT_BATCH_SIZE = 50_000
+
+# DB-API fetch size for cursors that are streamed row by row into a CSV file
+EXPORT_ARRAYSIZE = 10_000
+
+# Write buffer for streamed CSV files; large enough that each flush is a
+# single multi-MB write instead of many small ones
+CSV_WRITE_BUFFER_SIZE = 8 << 20
+
+# Supported output formats and the directory each one is written to
+OUTPUT_DIRS = {
+    'csv': "output_csv",
+    'parquet': "output_parquet",
+}
+
+# Number of tables exported concurrently within a single database
+TABLE_EXPORT_WORKERS = 4
+
+# Connection settings for sequential full-table scans: memory-map the file,
+# use a 256 MB page cache and keep temp structures in RAM. Syncing and the
+# rollback journal are switched off since the export never writes.
+SQLITE_BULK_READ_PRAGMAS = (
+    "PRAGMA mmap_size=30000000000",
+    "PRAGMA cache_size=-262144",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA synchronous=OFF",
+    "PRAGMA journal_mode=OFF",
+)
 
 def get_sqlite_files(base_dir="dev_databases"):
     """Find all SQLite files in the dev_databases directory."""
@@ -61,17 +94,35 @@ def get_sqlite_files(base_dir="dev_databases"):
         logger.error(f"Directory {base_dir} not found")
         return db_files
     
-    # Walk through all subdirectories and find .sqlite files
-    for root, dirs, files in os.walk(base_dir):
-        for file in files:
-            if file.endswith(".sqlite"):
-                db_files.append(os.path.join(root, file))
+    # Walk through all subdirectories and find .sqlite files; DirEntry caches
+    # the file type from the directory listing, avoiding a stat() per entry
+    pending_dirs = [base_dir]
+    while pending_dirs:
+        with os.scandir(pending_dirs.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    pending_dirs.append(entry.path)
+                elif entry.is_file() and entry.name.endswith(".sqlite"):
+                    db_files.append(entry.path)
     
     return db_files
 
+def sqlite_uri(sqlite_file):
+    """Build a read-only SQLite URI for a database file."""
+    # immutable=1 tells SQLite the file cannot change underneath us, so it
+    # skips journal checks and file locking for the whole connection
+    return f"file:{quote(os.path.abspath(sqlite_file))}?mode=ro&immutable=1"
+
+def connect_readonly(sqlite_file):
+    """Open a read-only connection to a SQLite database tuned for bulk reads."""
+    conn = sqlite3.connect(sqlite_uri(sqlite_file), uri=True)
+    for pragma in SQLITE_BULK_READ_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
 def get_sqlite_tables(sqlite_file):
     """Get all tables from a SQLite database."""
-    conn = sqlite3.connect(sqlite_file)
+    conn = connect_readonly(sqlite_file)
     cursor = conn.cursor()
     
     # Get all table names
@@ -81,139 +132,277 @@ def get_sqlite_tables(sqlite_file):
     
     return tables, conn
 
-def create_output_dirs():
+def get_sqlite_columns(conn):
+    """Get the column names and declared types of every table in one query."""
+    cursor = conn.cursor()
+    
+    # pragma_table_info() as a table-valued function (SQLite 3.16+) lets us
+    # collect all table schemas at once instead of one PRAGMA per table
+    cursor.execute("""
+        SELECT m.name, p.name, p.type
+        FROM sqlite_master AS m
+        JOIN pragma_table_info(m.name) AS p
+        WHERE m.type = 'table'
+        ORDER BY m.name, p.cid
+    """)
+    columns_by_table = {}
+    for table_name, col_name, col_type in cursor.fetchall():
+        columns_by_table.setdefault(table_name, []).append((col_name, col_type))
+    cursor.close()
+    
+    return columns_by_table
+
+def create_output_dirs(file_format='csv'):
     """Create the output directory structure."""
-    os.makedirs("output_csv", exist_ok=True)
+    data_dir = OUTPUT_DIRS[file_format]
+    os.makedirs(data_dir, exist_ok=True)
     os.makedirs("output_sql", exist_ok=True)
     
-    return "output_csv", "output_sql"
+    return data_dir, "output_sql"
 
-def export_table_to_csv(conn, table_name, db_name, csv_dir):
-    """Export a single table to a CSV file."""
-    try:
-        # Create a directory for the database
-        db_dir = os.path.join(csv_dir, db_name)
-        os.makedirs(db_dir, exist_ok=True)
+@contextlib.contextmanager
+def adbc_record_batches(sqlite_file, query):
+    """Run a query through ADBC and yield an Arrow record batch reader."""
+    # autocommit keeps ADBC from opening a transaction, which would reject
+    # PRAGMA synchronous
+    with adbc_sqlite.connect(sqlite_uri(sqlite_file), autocommit=True) as conn:
+        with conn.cursor() as cursor:
+            for pragma in SQLITE_BULK_READ_PRAGMAS:
+                cursor.execute(pragma)
+            cursor.execute(query)
+            yield cursor.fetch_record_batch()
+
+def export_table_with_adbc(sqlite_file, query, csv_file):
+    """Export a query result to CSV as Arrow record batches via ADBC."""
+    row_count = 0
+    with adbc_record_batches(sqlite_file, query) as reader:
+        write_options = pa_csv.WriteOptions(quoting_style='needed')
+        with pa_csv.CSVWriter(csv_file, reader.schema, write_options=write_options) as writer:
+            for batch in reader:
+                writer.write_batch(batch)
+                row_count += batch.num_rows
+    return row_count
+
+# Matches characters that force a CSV field to be quoted (QUOTE_MINIMAL rules)
+_CSV_NEEDS_QUOTING_RE = re.compile(r'[",\r\n]').search
+
+def _csv_field(value):
+    """Format any value as a CSV field the way csv.writer does with QUOTE_MINIMAL.
+    
+    Unlike csv.writer, empty strings are written as "" so that they stay
+    distinct from NULL, which is an empty field; the ADBC export does the same.
+    """
+    if value is None:
+        return ''
+    if value == '':
+        return '""'
+    text = value if value.__class__ is str else str(value)
+    if _CSV_NEEDS_QUOTING_RE(text):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+def column_kind(col_type):
+    """Classify a SQLite declared type by the Python value it usually holds."""
+    # Follows SQLite's type affinity rules for INTEGER and REAL
+    col_type_upper = col_type.upper() if col_type else ''
+    if 'INT' in col_type_upper:
+        return 'int'
+    if 'REAL' in col_type_upper or 'FLOA' in col_type_upper or 'DOUB' in col_type_upper:
+        return 'float'
+    return 'any'
+
+@functools.lru_cache(maxsize=256)
+def build_row_formatter(column_kinds):
+    """Generate a function that formats one row as a CSV line.
+    
+    The function is specialized for the given column kinds: integer and real
+    columns get an inline fast path for their expected type, and every value
+    of an unexpected type goes through _csv_field, so strings and NULLs are
+    written the way that function writes them.
+    """
+    names = [f"c{i}" for i in range(len(column_kinds))]
+    fields = []
+    for name, kind in zip(names, column_kinds):
+        if kind == 'int':
+            fields.append(f"{{'' if {name} is None else {name} if {name}.__class__ is int else _csv_field({name})}}")
+        elif kind == 'float':
+            fields.append(f"{{'' if {name} is None else repr({name}) if {name}.__class__ is float else _csv_field({name})}}")
+        else:
+            fields.append(f"{{_csv_field({name})}}")
+    source = (
+        "def format_row(row):\n"
+        f"    {', '.join(names)}, = row\n"
+        f"    return f\"{','.join(fields)}\\r\\n\"\n"
+    )
+    namespace = {'_csv_field': _csv_field}
+    exec(compile(source, "<csv row formatter>", "exec"), namespace)
+    return namespace['format_row']
+
+def export_table_with_cursor(conn, query, csv_file, columns):
+    """Export a query result to CSV by streaming rows through a row formatter.
+    
+    `columns` is the table's list of (column name, declared type) pairs and is
+    used to pick a row formatter specialized for its column types.
+    """
+    # Stream the table data from SQLite straight into the CSV file; the
+    # cursor is iterated directly, so rows are never collected into a list
+    cursor = conn.cursor()
+    cursor.arraysize = EXPORT_ARRAYSIZE
+    cursor.execute(query)
+    with open(csv_file, 'w', newline='', buffering=CSV_WRITE_BUFFER_SIZE) as f:
+        # QUOTE_MINIMAL only quotes fields containing delimiters, quotes or
+        # newlines; QUOTE_NONNUMERIC would call float() on every non-string cell
+        writer = csv.writer(f, quoting=csv.QUOTE_MINIMAL)
+        writer.writerow([col[0] for col in cursor.description])
         
-        # Create filename for the CSV file
-        csv_file = os.path.join(db_dir, f"{table_name}.csv")
+        # Count rows as they stream past without a Python-level loop
+        counter = itertools.count()
+        rows = map(operator.itemgetter(0), zip(cursor, counter))
         
-        # Check if table name is a reserved keyword
-        if table_name.upper() in SQL_RESERVED_KEYWORDS:
-            # Quote the table name for the query
-            query = f'SELECT * FROM "{table_name}"'
-            logger.info(f"Using quoted name for reserved keyword table: {table_name}")
+        # The generated formatter is used for every result, as csv.writer
+        # would write NULL and empty strings the same way
+        if len(columns) == len(cursor.description):
+            column_kinds = tuple(column_kind(col_type) for _, col_type in columns)
         else:
-            query = f"SELECT * FROM {table_name}"
+            column_kinds = ('any',) * len(cursor.description)
+        f.writelines(map(build_row_formatter(column_kinds), rows))
+    cursor.close()
+    return next(counter)
+
+def export_table_to_csv(sqlite_file, table_name, db_name, csv_dir, columns):
+    """Export a single table to a CSV file.
+    
+    Returns the name of the export method that succeeded, or None on failure.
+    """
+    try:
+        # Create filename for the CSV file in the database's directory
+        csv_file = os.path.join(csv_dir, db_name, f"{table_name}.csv")
         
-        # Extract the table data from SQLite
-        df = pd.read_sql_query(query, conn)
+        # Always quote the table name so reserved keywords and odd characters work
+        quoted_table_name = table_name.replace('"', '""')
+        query = f'SELECT * FROM "{quoted_table_name}"'
         
-        # Export to CSV
-        df.to_csv(csv_file, index=False, quoting=csv.QUOTE_NONNUMERIC)
+        # Prefer the vectorized Arrow path; ADBC infers one type per column,
+        # so tables with mixed-type columns fall back to the Python writer
+        if adbc_sqlite is not None:
+            try:
+                row_count = export_table_with_adbc(sqlite_file, query, csv_file)
+                logger.debug("Exported %s to %s with %d rows using ADBC", table_name, csv_file, row_count)
+                return 'adbc'
+            except Exception as e:
+                logger.warning(f"ADBC export failed for {table_name}, falling back: {e}")
         
-        logger.info(f"Exported {table_name} to {csv_file} with {len(df)} rows")
-        return True
+        # Only the Python writer needs a sqlite3 connection, so open it here
+        with contextlib.closing(connect_readonly(sqlite_file)) as conn:
+            row_count = export_table_with_cursor(conn, query, csv_file, columns)
+        logger.debug("Exported %s to %s with %d rows", table_name, csv_file, row_count)
+        return 'python'
     except Exception as e:
         logger.error(f"Error exporting table {table_name}: {e}")
-        return False
+        return None
+
+def arrow_type_for_sqlite_type(col_type):
+    """Map a SQLite declared column type to an Arrow type for Parquet output."""
+    col_type_upper = col_type.upper() if col_type else ''
+    if 'INT' in col_type_upper:
+        return pa.int64()
+    if col_type_upper in ['REAL', 'DOUBLE', 'FLOAT', 'NUMERIC', 'DECIMAL']:
+        return pa.float64()
+    if 'BLOB' in col_type_upper or 'BINARY' in col_type_upper:
+        return pa.binary()
+    return pa.string()
+
+def export_table_with_cursor_to_parquet(conn, query, parquet_file, arrow_types):
+    """Export a query result to Parquet by converting row batches to Arrow.
+    
+    `arrow_types` gives the Arrow type of each result column, or None to
+    write every column as a string.
+    """
+    cursor = conn.cursor()
+    cursor.execute(query)
+    names = [col[0] for col in cursor.description]
+    if arrow_types is None:
+        arrow_types = [pa.string()] * len(names)
+    schema = pa.schema(list(zip(names, arrow_types)))
+    
+    row_count = 0
+    with pa_parquet.ParquetWriter(parquet_file, schema, compression='snappy') as writer:
+        while True:
+            rows = cursor.fetchmany(EXPORT_BATCH_SIZE)
+            if not rows:
+                break
+            arrays = []
+            for values, field in zip(zip(*rows), schema):
+                if field.type == pa.string():
+                    values = [None if v is None else str(v) for v in values]
+                arrays.append(pa.array(values, type=field.type))
+            writer.write_batch(pa.RecordBatch.from_arrays(arrays, schema=schema))
+            row_count += len(rows)
+    cursor.close()
+    return row_count
 
-def generate_create_table_sql(conn, table_name, db_name, output_path):
-    """Generate CREATE TABLE SQL for Snowflake from a SQLite table schema."""
+def export_table_to_parquet(sqlite_file, table_name, db_name, data_dir, columns):
+    """Export a single table to a Snappy-compressed Parquet file.
+    
+    Returns the name of the export method that succeeded, or None on failure.
+    """
     try:
-        cursor = conn.cursor()
+        parquet_file = os.path.join(data_dir, db_name, f"{table_name}.parquet")
         
-        snowflake_db_name = db_name.upper()
-        original_table_name = table_name # Keep original for lookups
-
-        # Determine Snowflake table name (uppercase, quoted only if needed)
-        table_name_upper = original_table_name.upper()
-        if needs_quoting(table_name_upper): # Check the uppercased version
-            snowflake_table_name = f'"{table_name_upper}"'
-        else:
-            snowflake_table_name = table_name_upper
+        quoted_table_name = table_name.replace('"', '""')
+        query = f'SELECT * FROM "{quoted_table_name}"'
         
-        is_financial_order = original_table_name.lower() == 'order' and db_name.lower() == 'financial'
-
-        # Special case handling for the 'order' table in the financial database
-        if is_financial_order:
-            # Manually define the schema - use standard uppercase names here
-            columns_info = [
-                ('ORDER_ID', 'NUMBER'), 
-                ('ACCOUNT_ID', 'NUMBER'), 
-                ('BANK_TO', 'VARCHAR'), 
-                ('ACCOUNT_TO', 'VARCHAR'), 
-                ('AMOUNT', 'FLOAT'), 
-                ('K_SYMBOL', 'VARCHAR')
-            ]
-            logger.info(f"Using manual schema definition for: {original_table_name} in db {db_name}")
-            snowflake_table_name = '"ORDER"' # Explicitly quote the reserved keyword
-        else:
-            # Get the table schema using the original table name (quoting for PRAGMA if needed)
-            pragma_table_name = f'"{original_table_name}"' if needs_quoting(original_table_name) else original_table_name
+        if adbc_sqlite is not None:
             try:
-                cursor.execute(f'PRAGMA table_info({pragma_table_name})')
-                columns_pragma = cursor.fetchall()
-            except sqlite3.OperationalError as e:
-                 logger.error(f"PRAGMA failed for {db_name}.{original_table_name}: {e}")
-                 return False
-                 
-            if not columns_pragma:
-                logger.warning(f"No columns found via PRAGMA for {db_name}.{original_table_name}")
-                return False
-            
-            # Convert PRAGMA result to standard format
-            columns_info = []
-            for col in columns_pragma:
-                _cid, col_name, col_type, _notnull, _dflt_value, _pk = col
-                # Force uppercase for Snowflake standard identifiers
-                col_name_upper = col_name.upper()
-                # Quote if it contains non-standard chars or is a reserved keyword
-                snowflake_col_name = f'"{col_name_upper}"' if needs_quoting(col_name_upper) else col_name_upper
-
-                # Map SQLite types to Snowflake types
-                col_type_upper = col_type.upper() if col_type else ''
-                if 'INT' in col_type_upper:
-                    sf_type = 'NUMBER'
-                elif col_type_upper in ['REAL', 'DOUBLE', 'FLOAT', 'NUMERIC', 'DECIMAL']:
-                    sf_type = 'FLOAT'
-                elif col_type_upper in ['CHAR', 'VARCHAR', 'TEXT', 'NVARCHAR', 'CLOB']:
-                    sf_type = 'VARCHAR'
-                elif 'DATE' in col_type_upper or 'TIME' in col_type_upper:
-                    sf_type = 'TIMESTAMP_NTZ'
-                elif 'BOOL' in col_type_upper:
-                    sf_type = 'BOOLEAN'
-                elif 'BLOB' in col_type_upper or 'BINARY' in col_type_upper:
-                    sf_type = 'BINARY'
-                else:
-                    sf_type = 'VARCHAR'  # Default
-                    logger.warning(f"Unknown type '{col_type}' for {col_name} in {original_table_name}. Defaulting to VARCHAR.")
-                
-                columns_info.append((snowflake_col_name, sf_type))
-
-        # Construct the full table name for Snowflake
-        snowflake_full_table_name = f"{snowflake_db_name}_TABLE_{snowflake_table_name}"
+                row_count = 0
+                with adbc_record_batches(sqlite_file, query) as reader:
+                    with pa_parquet.ParquetWriter(parquet_file, reader.schema, compression='snappy') as writer:
+                        for batch in reader:
+                            writer.write_batch(batch)
+                            row_count += batch.num_rows
+                logger.debug("Exported %s to %s with %d rows using ADBC", table_name, parquet_file, row_count)
+                return 'adbc'
+            except Exception as e:
+                logger.warning(f"ADBC export failed for {table_name}, falling back: {e}")
         
-        # Start creating the SQL
-        create_table = f"CREATE OR REPLACE TABLE {snowflake_full_table_name} (\n"
-        column_defs = [f"    {col_name} {col_type}" for col_name, col_type in columns_info]
-        create_table += ",\n".join(column_defs)
-        create_table += "\n);"
+        # Use the declared column types; SQLite does not enforce them, so if a
+        # value does not fit, write the whole table with string columns instead
+        arrow_types = [arrow_type_for_sqlite_type(col_type) for _, col_type in columns] or None
+        with contextlib.closing(connect_readonly(sqlite_file)) as conn:
+            try:
+                row_count = export_table_with_cursor_to_parquet(conn, query, parquet_file, arrow_types)
+            except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError) as e:
+                logger.warning(f"Values in {table_name} do not match declared types ({e}), writing string columns")
+                row_count = export_table_with_cursor_to_parquet(conn, query, parquet_file, None)
         
-        # Write the SQL to a file 
-        output_file = os.path.join(output_path, f"{db_name}_{original_table_name}.sql")
-        with open(output_file, 'w') as f:
-            f.write(create_table)
-            
-        logger.info(f"Generated SQL file for {db_name}.{original_table_name} -> {snowflake_full_table_name}")
-        return True
+        logger.debug("Exported %s to %s with %d rows", table_name, parquet_file, row_count)
+        return 'python'
     except Exception as e:
-        import traceback
-        logger.error(f"Error generating SQL for {db_name}.{original_table_name}: {e}\n{traceback.format_exc()}")
-        return False
+        logger.error(f"Error exporting table {table_name}: {e}")
+        return None
+
+def export_table(sqlite_file, table_name, db_name, data_dir, sql_dir, columns, snowflake_db_name,
+                 is_financial_db, file_format='csv'):
+    """Export one table's data and generate its SQL.
+    
+    The exporters open their own SQLite connection, so each worker thread
+    reads through a separate one; SQLite allows concurrent readers.
+    """
+    if file_format == 'parquet':
+        data_ok = export_table_to_parquet(sqlite_file, table_name, db_name, data_dir, columns)
+    else:
+        data_ok = export_table_to_csv(sqlite_file, table_name, db_name, data_dir, columns)
+    sql_ok = generate_create_table_sql(
+        table_name, db_name, sql_dir, columns, snowflake_db_name, is_financial_db
+    )
+    return data_ok, sql_ok
 
-def process_sqlite_file(sqlite_file, csv_dir, sql_dir):
-    """Process a single SQLite file and export all its tables."""
+def process_sqlite_file(sqlite_file, data_dir, sql_dir, file_format='csv'):
+    """Process a single SQLite file and export all its tables.
+    
+    Returns a (table count, tables exported) tuple, or None if the
+    database could not be processed.
+    """
     try:
         # Extract database name from file path - use the directory name
         db_name = os.path.basename(os.path.dirname(sqlite_file))
@@ -226,42 +415,82 @@ def process_sqlite_file(sqlite_file, csv_dir, sql_dir):
         
         # Get all tables from the SQLite database
         tables, conn = get_sqlite_tables(sqlite_file)
+        columns_by_table = get_sqlite_columns(conn)
+        conn.close()
+        
+        # Create the database's output directory once for all of its tables
+        os.makedirs(os.path.join(data_dir, db_name), exist_ok=True)
+        
+        # Per-database constants used when generating each table's SQL
+        snowflake_db_name = db_name.upper()
+        is_financial_db = db_name.lower() == 'financial'
         
         # Export each table
-        csv_success_count = 0
+        export_methods = Counter()
         sql_success_count = 0
         failed_tables = []
         
-        for table_name in tables:
-            if export_table_to_csv(conn, table_name, db_name, csv_dir):
-                csv_success_count += 1
-            else:
-                failed_tables.append(f"{table_name} (csv)")
+        with ThreadPoolExecutor(max_workers=TABLE_EXPORT_WORKERS) as executor:
+            futures = {
+                executor.submit(
+                    export_table, sqlite_file, table_name, db_name, data_dir, sql_dir,
+                    columns_by_table.get(table_name, []), snowflake_db_name, is_financial_db, file_format
+                ): table_name
+                for table_name in tables
+            }
             
-            if generate_create_table_sql(conn, table_name, db_name, sql_dir):
-                sql_success_count += 1
-            else:
-                failed_tables.append(f"{table_name} (sql)")
-                logger.error(f"Failed to generate SQL for table {table_name}")
-        
-        conn.close()
+            for future in as_completed(futures):
+                table_name = futures[future]
+                data_ok, sql_ok = future.result()
+                
+                if data_ok:
+                    export_methods[data_ok] += 1
+                else:
+                    failed_tables.append(f"{table_name} ({file_format})")
+                
+                if sql_ok:
+                    sql_success_count += 1
+                else:
+                    failed_tables.append(f"{table_name} (sql)")
+                    logger.error(f"Failed to generate SQL for table {table_name}")
         
-        logger.info(f"Completed {db_name}: {csv_success_count}/{len(tables)} tables exported to CSV")
-        logger.info(f"Completed {db_name}: {sql_success_count}/{len(tables)} CREATE TABLE statements generated")
+        data_success_count = sum(export_methods.values())
+        methods_summary = ", ".join(f"{method}: {count}" for method, count in export_methods.most_common())
+        logger.info(
+            f"Completed {db_name}: {data_success_count}/{len(tables)} tables exported to {file_format.upper()}"
+            f" ({methods_summary or 'none'}), {sql_success_count}/{len(tables)} CREATE TABLE statements generated"
+        )
         
         if failed_tables:
             logger.warning(f"Failed tables for {db_name}: {', '.join(failed_tables)}")
         
-        return True
+        return len(tables), data_success_count
     except Exception as e:
         logger.error(f"Error processing SQLite file {sqlite_file}: {e}")
-        return False
+        return None
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Export BIRD SQLite databases for upload to Snowflake.")
+    parser.add_argument(
+        "--format",
+        choices=sorted(OUTPUT_DIRS),
+        default='csv',
+        help="Output file format for table data (default: csv)"
+    )
+    return parser.parse_args()
 
 def main():
     """Main function to export all SQLite databases to CSV files."""
+    args = parse_args()
+    
     # Load environment variables
     load_dotenv()
     
+    if args.format == 'parquet' and pa is None:
+        logger.error("pyarrow is required for Parquet output. Try: pip install pyarrow")
+        sys.exit(1)
+    
     try:
         # Get all SQLite files from dev_databases folder
         sqlite_files = get_sqlite_files()
@@ -272,34 +501,29 @@ def main():
             sys.exit(1)
         
         # Create output directories
-        csv_dir, sql_dir = create_output_dirs()
+        data_dir, sql_dir = create_output_dirs(args.format)
         
         # Process each SQLite file
         success_count = 0
         total_tables = 0
         exported_tables = 0
         
-        for i, sqlite_file in enumerate(tqdm(sqlite_files, desc="Processing SQLite files")):
-            logger.info(f"Processing file {i+1}/{len(sqlite_files)}: {sqlite_file}")
+        # Each database is independent, so export them in parallel worker processes
+        with ProcessPoolExecutor(initializer=setup_logging) as executor:
+            futures = {
+                executor.submit(process_sqlite_file, sqlite_file, data_dir, sql_dir, args.format): sqlite_file
+                for sqlite_file in sqlite_files
+            }
             
-            # Get table count before processing
-            tables, conn = get_sqlite_tables(sqlite_file)
-            total_tables += len(tables)
-            conn.close()
-            
-            if process_sqlite_file(sqlite_file, csv_dir, sql_dir):
-                success_count += 1
-                
-                # Count successfully exported tables
-                db_name = os.path.basename(os.path.dirname(sqlite_file))
-                if db_name == "dev_databases":
-                    db_name = os.path.splitext(os.path.basename(sqlite_file))[0]
-                    
-                db_dir = os.path.join(csv_dir, db_name)
-                if os.path.exists(db_dir):
-                    exported_tables += len([f for f in os.listdir(db_dir) if f.endswith('.csv')])
+            for future in tqdm(as_completed(futures), total=len(futures), desc="Processing SQLite files"):
+                result = future.result()
+                if result is not None:
+                    table_count, exported_count = result
+                    success_count += 1
+                    total_tables += table_count
+                    exported_tables += exported_count
         
-        logger.info(f"Completed exporting {success_count}/{len(sqlite_files)} databases to CSV")
+        logger.info(f"Completed exporting {success_count}/{len(sqlite_files)} databases to {args.format.upper()}")
         logger.info(f"Exported {exported_tables}/{total_tables} tables in total")
         
     except Exception as e:
@@ -307,4 +531,5 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
+    setup_logging()
     main() 
\ No newline at end of file
@@ -0,0 +1,125 @@
+"""
+Snowflake SQL Generation
+
+Helpers for quoting identifiers and generating Snowflake CREATE TABLE statements
+from SQLite table schemas. This module only does string work and deliberately
+imports nothing beyond the standard library, so it stays cheap to import.
+"""
+
+import os
+import functools
+import logging
+import re
+
+logger = logging.getLogger(__name__)
+
+# Set of SQL reserved keywords that need special handling
+SQL_RESERVED_KEYWORDS = frozenset({
+    'ORDER', 'GROUP', 'TABLE', 'INDEX', 'SELECT', 'FROM', 'WHERE', 'JOIN',
+    'HAVING', 'WITH', 'OR', 'AND', 'NOT', 'NULL', 'TRUE', 'FALSE', 'DEFAULT',
+    'CREATE', 'ALTER', 'DROP', 'INSERT', 'UPDATE', 'DELETE', 'CASE', 'WHEN',
+    'THEN', 'ELSE', 'END', 'GRANT', 'REVOKE', 'COMMIT', 'ROLLBACK', 'NATURAL'
+})
+
+# Matches identifiers made only of uppercase letters, numbers and underscores
+_SAFE_IDENT_RE = re.compile(r'^[A-Z_][A-Z0-9_]*$').match
+
+# Function to check if an identifier needs quoting in Snowflake; identifiers such
+# as ID or NAME repeat across tables and databases, so results are memoized
+@functools.lru_cache(maxsize=4096)
+def needs_quoting(identifier):
+    """Check if an identifier contains non-standard chars or is a reserved keyword."""
+    # Already quoted?
+    if identifier.startswith('"') and identifier.endswith('"'):
+        return False 
+    # Anything other than uppercase letters, numbers, underscores (lowercase,
+    # spaces, hyphens, other symbols) or a reserved keyword needs quoting
+    return not _SAFE_IDENT_RE(identifier) or identifier in SQL_RESERVED_KEYWORDS
+
+def generate_create_table_sql(table_name, db_name, output_path, columns, snowflake_db_name, is_financial_db):
+    """Generate CREATE TABLE SQL for Snowflake from a SQLite table schema.
+    
+    `columns` is the list of (column name, declared type) pairs for the table,
+    as collected by get_sqlite_columns. `snowflake_db_name` (the uppercased
+    database name) and `is_financial_db` are the same for every table in a
+    database, so callers compute them once per database.
+    """
+    try:
+        original_table_name = table_name # Keep original for lookups
+
+        # Determine Snowflake table name (uppercase, quoted only if needed)
+        table_name_upper = original_table_name.upper()
+        if needs_quoting(table_name_upper): # Check the uppercased version
+            snowflake_table_name = f'"{table_name_upper}"'
+        else:
+            snowflake_table_name = table_name_upper
+        
+        is_financial_order = is_financial_db and original_table_name.lower() == 'order'
+
+        # Special case handling for the 'order' table in the financial database
+        if is_financial_order:
+            # Manually define the schema - use standard uppercase names here
+            columns_info = [
+                ('ORDER_ID', 'NUMBER'), 
+                ('ACCOUNT_ID', 'NUMBER'), 
+                ('BANK_TO', 'VARCHAR'), 
+                ('ACCOUNT_TO', 'VARCHAR'), 
+                ('AMOUNT', 'FLOAT'), 
+                ('K_SYMBOL', 'VARCHAR')
+            ]
+            logger.debug("Using manual schema definition for: %s in db %s", original_table_name, db_name)
+            snowflake_table_name = '"ORDER"' # Explicitly quote the reserved keyword
+        else:
+            if not columns:
+                logger.warning(f"No columns found via PRAGMA for {db_name}.{original_table_name}")
+                return False
+            
+            # Convert PRAGMA result to standard format
+            columns_info = []
+            for col_name, col_type in columns:
+                # Force uppercase for Snowflake standard identifiers
+                col_name_upper = col_name.upper()
+                # Quote if it contains non-standard chars or is a reserved keyword
+                snowflake_col_name = f'"{col_name_upper}"' if needs_quoting(col_name_upper) else col_name_upper
+
+                # Map SQLite types to Snowflake types
+                col_type_upper = col_type.upper() if col_type else ''
+                if 'INT' in col_type_upper:
+                    sf_type = 'NUMBER'
+                elif col_type_upper in ['REAL', 'DOUBLE', 'FLOAT', 'NUMERIC', 'DECIMAL']:
+                    sf_type = 'FLOAT'
+                elif col_type_upper in ['CHAR', 'VARCHAR', 'TEXT', 'NVARCHAR', 'CLOB']:
+                    sf_type = 'VARCHAR'
+                elif 'DATE' in col_type_upper or 'TIME' in col_type_upper:
+                    sf_type = 'TIMESTAMP_NTZ'
+                elif 'BOOL' in col_type_upper:
+                    sf_type = 'BOOLEAN'
+                elif 'BLOB' in col_type_upper or 'BINARY' in col_type_upper:
+                    sf_type = 'BINARY'
+                else:
+                    sf_type = 'VARCHAR'  # Default
+                    logger.warning(f"Unknown type '{col_type}' for {col_name} in {original_table_name}. Defaulting to VARCHAR.")
+                
+                columns_info.append((snowflake_col_name, sf_type))
+
+        # Construct the full table name for Snowflake
+        snowflake_full_table_name = f"{snowflake_db_name}_TABLE_{snowflake_table_name}"
+        
+        # Start creating the SQL
+        create_table = f"CREATE OR REPLACE TABLE {snowflake_full_table_name} (\n"
+        column_defs = [f"    {col_name} {col_type}" for col_name, col_type in columns_info]
+        create_table += ",\n".join(column_defs)
+        create_table += "\n);"
+        
+        # Write the SQL to a file 
+        output_file = os.path.join(output_path, f"{db_name}_{original_table_name}.sql")
+        with open(output_file, 'w') as f:
+            f.write(create_table)
+            
+        logger.debug("Generated SQL file for %s.%s -> %s", db_name, original_table_name, snowflake_full_table_name)
+        return True
+    except Exception as e:
+        logger.error(f"Error generating SQL for {db_name}.{original_table_name}: {e}")
+        # Full traceback only when running at DEBUG level
+        logger.debug("Traceback for %s.%s", db_name, original_table_name, exc_info=True)
+        return False
@@ -0,0 +1,134 @@
+"""
+Tests for the CSV row formatter in export_to_csv.py.
+
+The generated formatter replaces csv.writer, so its output is checked against
+csv.writer with QUOTE_MINIMAL. The only intended difference is that empty
+strings are written as "" to keep them distinct from NULL.
+
+Run with: python -m unittest discover tests
+"""
+
+import csv
+import io
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from export_to_csv import build_row_formatter, export_table_with_cursor
+
+# Values covering NULL, CSV special characters, float edge cases and values
+# whose type does not match the column's declared kind
+SAMPLE_VALUES = [
+    None, '', 'plain', 'a"b', 'a,b', 'a\nb', 'a\rb', '"', ',', ' padded ',
+    0, -7, 2**70, True, 1.5, 0.1 + 0.2, float('nan'), float('inf'), float('-inf'), -0.0,
+    b'', b'\x00\x01', b'a"b,c', 'x',
+]
+
+KINDS = ('int', 'float', 'any')
+
+
+def writer_line(row):
+    """Format a row with csv.writer and QUOTE_MINIMAL."""
+    buffer = io.StringIO()
+    csv.writer(buffer, quoting=csv.QUOTE_MINIMAL).writerow(row)
+    return buffer.getvalue()
+
+
+def writer_field(value):
+    """Format a single value as csv.writer does inside a multi-column row."""
+    return writer_line([value, 'x'])[:-len(',x\r\n')]
+
+
+def expected_line(row):
+    """Format a row as the generated formatter should: csv.writer's fields, with '' as ""."""
+    return ','.join('""' if value == '' else writer_field(value) for value in row) + '\r\n'
+
+
+class BuildRowFormatterTest(unittest.TestCase):
+
+    def test_matches_csv_writer_without_empty_strings(self):
+        values = [value for value in SAMPLE_VALUES if value != '']
+        for kind in KINDS:
+            format_row = build_row_formatter((kind, 'any'))
+            for value in values:
+                row = (value, 'tail')
+                with self.subTest(kind=kind, value=value):
+                    self.assertEqual(format_row(row), writer_line(row))
+
+    def test_matches_csv_writer_per_column_kind(self):
+        for first_kind in KINDS:
+            for second_kind in KINDS:
+                format_row = build_row_formatter((first_kind, second_kind))
+                for first in SAMPLE_VALUES:
+                    for second in SAMPLE_VALUES:
+                        row = (first, second)
+                        with self.subTest(kinds=(first_kind, second_kind), row=row):
+                            self.assertEqual(format_row(row), expected_line(row))
+
+    def test_null_and_empty_string_differ(self):
+        format_row = build_row_formatter(('any', 'int', 'float'))
+        self.assertEqual(format_row((None, None, None)), ',,\r\n')
+        self.assertEqual(format_row(('', '', '')), '"","",""\r\n')
+
+    def test_single_column_rows(self):
+        for kind in KINDS:
+            format_row = build_row_formatter((kind,))
+            for value in SAMPLE_VALUES:
+                if value is None or value == '':
+                    continue
+                with self.subTest(kind=kind, value=value):
+                    self.assertEqual(format_row((value,)), writer_line([value]))
+            # csv.writer writes both of these as "", which would load NULL as
+            # an empty string; the formatter keeps them apart, like ADBC does
+            self.assertEqual(format_row((None,)), '\r\n')
+            self.assertEqual(format_row(('',)), '""\r\n')
+
+    def test_round_trips_through_csv_reader(self):
+        format_row = build_row_formatter(('int', 'float', 'any'))
+        row = (3, 2.5, 'line one\r\nline "two", three')
+        parsed = next(csv.reader(io.StringIO(format_row(row), newline='')))
+        self.assertEqual(parsed, ['3', '2.5', row[2]])
+
+
+class ExportTableWithCursorTest(unittest.TestCase):
+
+    def setUp(self):
+        self.conn = sqlite3.connect(':memory:')
+        self.conn.execute('CREATE TABLE t (id INTEGER, amount REAL, note TEXT)')
+        self.columns = [('id', 'INTEGER'), ('amount', 'REAL'), ('note', 'TEXT')]
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.addCleanup(self.conn.close)
+        self.csv_file = os.path.join(tmp_dir.name, 't.csv')
+
+    def read_csv(self):
+        with open(self.csv_file, newline='') as f:
+            return list(csv.reader(f))
+
+    def test_empty_table_writes_header_only(self):
+        row_count = export_table_with_cursor(self.conn, 'SELECT * FROM t', self.csv_file, self.columns)
+        self.assertEqual(row_count, 0)
+        self.assertEqual(self.read_csv(), [['id', 'amount', 'note']])
+
+    def test_returns_row_count(self):
+        rows = [(i, i * 0.1, f'note, {i}') for i in range(2500)] + [(None, None, None), (1, 1.0, '')]
+        self.conn.executemany('INSERT INTO t VALUES (?, ?, ?)', rows)
+        row_count = export_table_with_cursor(self.conn, 'SELECT * FROM t', self.csv_file, self.columns)
+        self.assertEqual(row_count, len(rows))
+
+        lines = self.read_csv()
+        self.assertEqual(len(lines), len(rows) + 1)
+        self.assertEqual(lines[1], ['0', '0.0', 'note, 0'])
+        self.assertEqual(lines[4], ['3', repr(3 * 0.1), 'note, 3'])
+
+    def test_single_column_result(self):
+        self.conn.executemany('INSERT INTO t (note) VALUES (?)', [('a',), (None,), ('',)])
+        row_count = export_table_with_cursor(self.conn, 'SELECT note FROM t', self.csv_file, [])
+        self.assertEqual(row_count, 3)
+        with open(self.csv_file, newline='') as f:
+            self.assertEqual(f.read(), 'note\r\na\r\n\r\n""\r\n')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -7,6 +7,11 @@ to an existing Snowflake database using external browser authentication.
 """
 
 import os
+import csv
+import tempfile
+import queue
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import Counter
 import pandas as pd
 import snowflake.connector
 from snowflake.connector.pandas_tools import write_pandas
@@ -14,10 +19,25 @@ from dotenv import load_dotenv
 import logging
 import sys
 from tqdm import tqdm
+# The same reserved keywords the export uses, so quoting decisions (and
+# therefore table names) match the generated SQL
+from sql_gen import SQL_RESERVED_KEYWORDS
 import importlib
+import importlib.util
 import time
 import re
-import numpy as np # Import numpy for np.nan
+
+# Optional: pyarrow is needed to convert CSV files to Parquet for staged uploads
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pa_parquet
+except ImportError:
+    pa = None
+    pc = None
+    pa_csv = None
+    pa_parquet = None
 
 # Set up logging
 logging.basicConfig(
@@ -30,15 +50,78 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# List of SQL reserved keywords that need special handling (copied from export_to_csv.py)
-SQL_RESERVED_KEYWORDS = [
-    'ORDER', 'GROUP', 'TABLE', 'INDEX', 'SELECT', 'FROM', 'WHERE', 'JOIN',
-    'HAVING', 'WITH', 'OR', 'AND', 'NOT', 'NULL', 'TRUE', 'FALSE', 'DEFAULT',
-    'CREATE', 'ALTER', 'DROP', 'INSERT', 'UPDATE', 'DELETE', 'CASE', 'WHEN',
-    'THEN', 'ELSE', 'END', 'GRANT', 'REVOKE', 'COMMIT', 'ROLLBACK', 'NATURAL'
-]
+# How table data is loaded into Snowflake: 'csv' PUTs each CSV file as-is to a
+# temporary stage and loads it with COPY INTO; 'parquet' loads the Parquet
+# export if there is one and otherwise converts each CSV file to Parquet with
+# pyarrow first; 'pandas' uses write_pandas
+UPLOAD_METHODS = ('csv', 'parquet', 'pandas')
+
+# Snowflake error codes (ProgrammingError.errno) handled when creating tables
+SF_ERRNO_SYNTAX_ERROR = 1003 # SQL compilation error: syntax error ...
+SF_ERRNO_ALREADY_EXISTS = 2002 # Object '...' already exists
+
+# Number of CREATE TABLE statements sent to Snowflake in one multi-statement request
+CREATE_BATCH_SIZE = 20
+
+# Number of tables uploaded concurrently, each worker on its own connection
+UPLOAD_WORKERS = 8
+
+# Session-scoped stage that CSV and Parquet files are PUT to before COPY INTO
+UPLOAD_STAGE = "BIRD_UPLOAD_STAGE"
+
+# Block size pyarrow uses when parsing CSV files in parallel
+CSV_READ_BLOCK_SIZE = 64 << 20
+
+# Number of threads the connector uses to PUT each file to the stage
+PUT_PARALLEL = 8
+
+# write_pandas tuning: Snappy encodes much faster than the default gzip, more
+# PUT threads keep the stage upload busy, and chunks are sized so each staged
+# Parquet file holds roughly this many bytes of CSV input
+WRITE_PANDAS_COMPRESSION = 'snappy'
+WRITE_PANDAS_PARALLEL = 16
+WRITE_PANDAS_CHUNK_BYTES = 128 << 20
 
-# Function to check if an identifier needs quoting in Snowflake (copied from export_to_csv.py)
+# Column type categories (from parse_sql_columns) whose empty CSV fields are loaded as NULL
+NULLABLE_TYPE_CATEGORIES = ('NUMBER', 'FLOAT', 'TIMESTAMP')
+
+# Reserved words that make a table name need quoting when they appear as one
+# of its underscore-separated parts (see fix_reserved_keyword_table_name)
+TABLE_NAME_RESERVED_KEYWORDS = frozenset({
+    'ORDER', 'TABLE', 'GROUP', 'SELECT', 'FROM', 'WHERE',
+    'GRANT', 'REFERENCES', 'TRANSACTION', 'PRIMARY',
+    'FOREIGN', 'NATURAL', 'SESSION', 'USING'
+})
+
+# Matches identifiers made only of uppercase letters, numbers and underscores
+_UPPER_IDENT_RE = re.compile(r'^[A-Z_][A-Z0-9_]*$')
+
+# Matches standard identifiers in any case
+_MIXED_IDENT_RE = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+
+# Matches column definitions in generated CREATE TABLE statements, e.g.
+# `    COLUMN_NAME TYPE,` or `    "COLUMN NAME" TYPE,`. Quoted and unquoted
+# names are separate alternatives (only quoted names may contain spaces), so
+# a malformed line fails fast instead of backtracking over every split
+_COLUMN_DEF_RE = re.compile(r'^\s*(?:"([^"]+)"|([A-Za-z_][\w\-\/]*))\s+([A-Z_]+(?:\(\d+\))?)\s*(?:[,)]|$)',
+                            re.MULTILINE | re.IGNORECASE)
+
+# Matches the (possibly quoted) table name in a CREATE OR REPLACE TABLE statement
+_CREATE_TABLE_RE = re.compile(r'CREATE OR REPLACE TABLE\s+([^\(]+)\(?', re.IGNORECASE)
+
+# Number of leading characters of a SQL file searched for the CREATE TABLE header
+CREATE_HEADER_SEARCH_CHARS = 512
+
+# Matches everything fix_create_table_sql rewrites before a CREATE TABLE is
+# retried: the table name, unquoted column definitions (with an optional empty
+# length after the type) and any remaining empty VARCHAR() lengths
+_FIX_CREATE_RE = re.compile(
+    r'(?P<table_kw>\bTABLE\s+)(?P<table>[^\s(][^(]*?)(?=\s*\()'
+    r'|(?P<col_ws>\s+)(?P<col>[a-zA-Z0-9_\s]+)\s+(?P<type>VARCHAR|INTEGER|FLOAT|BINARY|BOOLEAN|NUMBER|TIMESTAMP|DATE|CHAR)(?P<empty_len>\(\))?'
+    r'|(?P<varchar>VARCHAR\(\))'
+)
+
+# Function to check if an identifier needs quoting in Snowflake
 def needs_quoting(identifier):
     """Check if an identifier contains spaces, special chars, is a keyword, or isn't uppercase standard."""
     # Already quoted?
@@ -52,9 +135,9 @@ def needs_quoting(identifier):
         return True
     # Check if it's not entirely standard (uppercase letters, numbers, underscores)
     # Allows mixed case standard identifiers without forcing quotes
-    if not re.match(r'^[A-Z_][A-Z0-9_]*$', identifier):
+    if not _UPPER_IDENT_RE.match(identifier):
        # Check if it's just lowercase/mixed case standard identifier
-       if re.match(r'^[a-zA-Z_][a-zA-Z0-9_]*$', identifier):
+       if _MIXED_IDENT_RE.match(identifier):
            return False # Needs uppercasing, but not quoting
        else:
            # Contains other special chars, needs quoting
@@ -86,98 +169,73 @@ def check_dependencies():
         logger.error(f"Dependency check failed: {str(e)}")
         return False
 
-def table_exists_and_has_data(conn, table_name):
-    """Check if a table exists and already has data in it."""
-    cursor = conn.cursor()
-    try:
-        # First, check if the table exists by querying it
-        cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-        count = cursor.fetchone()[0]
-        cursor.close()
-        
-        # If we got a result, the table exists and has count rows
-        return True, count
-    except Exception as e:
-        # If the table doesn't exist or there's any other error
-        cursor.close()
-        if "does not exist" in str(e).lower() or "invalid object" in str(e).lower():
-            return False, 0
-        else:
-            # For any other error, assume the table exists but there's a problem with the query
-            logger.warning(f"Error checking if table {table_name} has data: {e}")
-            return True, 0
-
 def fix_reserved_keyword_table_name(table_name):
     """Add double quotes to table names that contain reserved keywords."""
-    # List of common reserved words in Snowflake
-    reserved_keywords = ["ORDER", "TABLE", "GROUP", "SELECT", "FROM", "WHERE", 
-                         "GRANT", "REFERENCES", "TRANSACTION", "PRIMARY", 
-                         "FOREIGN", "NATURAL", "SESSION", "USING"]
-    
     # Check if any part of the table name is a reserved keyword
     parts = table_name.split('_')
     for part in parts:
-        if part.upper() in reserved_keywords:
+        if part.upper() in TABLE_NAME_RESERVED_KEYWORDS:
             # Quote the entire table name
             return f'"{table_name}"'
     
     # Return as is if no reserved keywords found
     return table_name
 
+def quote_table_name(table_full_name):
+    """Quote a full table name for a CREATE TABLE retry."""
+    # Check if the table name already has quotes within it
+    if '"' not in table_full_name:
+        # Normal case - just quote the whole name
+        return f'"{table_full_name}"'
+    # For already quoted tables (from reserved keywords), handle differently
+    db_part, separator, table_part = table_full_name.partition('_TABLE_')
+    if not separator:
+        return table_full_name
+    if table_part.startswith('"') and table_part.endswith('"'):
+        # Already has quotes, so wrap the entire name
+        return f'"{db_part}_TABLE_{table_part[1:-1]}"'
+    return f'"{table_full_name}"'
+
+def _fix_create_table_match(match):
+    """Rewrite one _FIX_CREATE_RE match (see fix_create_table_sql)."""
+    if match.group('table') is not None:
+        return match.group('table_kw') + quote_table_name(match.group('table'))
+    if match.group('col') is not None:
+        col_type = match.group('type')
+        if match.group('empty_len'):
+            col_type += '(16777216)'
+        return f'{match.group("col_ws")}"{match.group("col").strip()}" {col_type}'
+    return 'VARCHAR(16777216)'
+
+def fix_create_table_sql(sql_content):
+    """Fix common syntax issues in a CREATE TABLE statement in a single pass.
+    
+    Quotes the table name and unquoted column names, and replaces empty
+    VARCHAR() lengths with the maximum length.
+    """
+    return _FIX_CREATE_RE.sub(_fix_create_table_match, sql_content)
+
 def create_table_with_retry(cursor, sql_content, table_full_name, max_retries=3):
     """Attempt to create a table with retry logic, handling common errors."""
     retries = 0
+    sql_fixed = False
     while retries < max_retries:
         try:
             cursor.execute(sql_content)
             logger.info(f"Created table: {table_full_name}")
             return True
         except Exception as e:
-            error_str = str(e).lower()
-            
-            # Handle specific errors
-            if "already exists" in error_str:
+            # Handle specific errors by Snowflake error code
+            errno = e.errno if isinstance(e, snowflake.connector.errors.Error) else None
+            if errno == SF_ERRNO_ALREADY_EXISTS:
                 logger.info(f"Table {table_full_name} already exists")
                 return True
-            elif "syntax error" in error_str:
-                # Try to fix common SQL syntax issues
-                if retries == 0:
-                    # Try adding quotes around the table name
-                    # Check if the table name already has quotes within it
-                    if '"' in table_full_name:
-                        # For already quoted tables (from reserved keywords), handle differently
-                        parts = table_full_name.split('_TABLE_')
-                        if len(parts) == 2:
-                            db_part = parts[0]
-                            table_part = parts[1]
-                            if table_part.startswith('"') and table_part.endswith('"'):
-                                # Already has quotes, so wrap the entire name
-                                sql_content = sql_content.replace(f"TABLE {table_full_name}", f'TABLE "{db_part}_TABLE_{table_part[1:-1]}"')
-                            else:
-                                sql_content = sql_content.replace(f"TABLE {table_full_name}", f'TABLE "{table_full_name}"')
-                    else:
-                        # Normal case - just quote the whole name
-                        sql_content = sql_content.replace(f"TABLE {table_full_name}", f'TABLE "{table_full_name}"')
-                    logger.info(f"Retrying with quoted table name: {table_full_name}")
-                elif retries == 1:
-                    # Try replacing problematic data types
-                    sql_content = sql_content.replace("VARCHAR()", "VARCHAR(16777216)")
-                    logger.info(f"Retrying with fixed VARCHAR data types")
-                    
-                    # Also check for unquoted column names and quote them
-                    column_pattern = re.compile(r'\s+([a-zA-Z0-9_\s]+)\s+(VARCHAR|INTEGER|FLOAT|BINARY|BOOLEAN|NUMBER|TIMESTAMP|DATE|CHAR)')
-                    
-                    def quote_column_name(match):
-                        col_name = match.group(1).strip()
-                        col_type = match.group(2)
-                        # If the column name isn't already quoted and contains a space or is a keyword
-                        if not (col_name.startswith('"') and col_name.endswith('"')):
-                            return f'    "{col_name}" {col_type}'
-                        return match.group(0)
-                    
-                    # Replace unquoted column names with quoted ones
-                    sql_content = column_pattern.sub(quote_column_name, sql_content)
-                    logger.info("Retrying with quoted column names")
+            elif errno == SF_ERRNO_SYNTAX_ERROR:
+                # Try to fix common SQL syntax issues, all in one pass
+                if not sql_fixed:
+                    sql_content = fix_create_table_sql(sql_content)
+                    sql_fixed = True
+                    logger.info(f"Retrying with quoted table and column names and fixed VARCHAR data types: {table_full_name}")
                 else:
                     logger.error(f"Failed to create table {table_full_name} after retries: {e}")
                     return False
@@ -193,39 +251,347 @@ def create_table_with_retry(cursor, sql_content, table_full_name, max_retries=3)
     
     return False
 
+def create_table(cursor, table_full_name, sql_content):
+    """Create one table from its CREATE TABLE SQL; returns True on success."""
+    try:
+        # Special handling for FINANCIAL_TABLE_ORDER - create directly
+        if table_full_name == 'FINANCIAL_TABLE_"ORDER"':
+            logger.info(f"Attempting to create special table {table_full_name} directly.")
+            # Execute exactly the SQL read from the file
+            cursor.execute(sql_content)
+            logger.info(f"Created table: {table_full_name}")
+            return True
+        # Use retry logic for other tables
+        return create_table_with_retry(cursor, sql_content, table_full_name)
+    except Exception as e:
+        logger.error(f"Failed to create table {table_full_name}: {str(e)}")
+        return False
+
+def create_tables(cursor, tables):
+    """Create tables from (table name, CREATE TABLE SQL) pairs.
+    
+    Up to CREATE_BATCH_SIZE statements are sent per round trip as one
+    multi-statement request. If a batch fails, its tables are created one at
+    a time through create_table, which re-runs the CREATE OR REPLACE of any
+    table the batch already created. Returns the names of the tables created.
+    """
+    created = []
+    for start in range(0, len(tables), CREATE_BATCH_SIZE):
+        batch = tables[start:start + CREATE_BATCH_SIZE]
+        if len(batch) == 1:
+            if create_table(cursor, *batch[0]):
+                created.append(batch[0][0])
+            continue
+        batch_sql = "\n".join(sql_content.strip().rstrip(';') + ';' for _, sql_content in batch)
+        try:
+            cursor.execute(batch_sql, num_statements=len(batch))
+            for table_full_name, _ in batch:
+                logger.info(f"Created table: {table_full_name}")
+                created.append(table_full_name)
+        except Exception as e:
+            logger.info(f"Batched CREATE TABLE failed ({e}), creating {len(batch)} tables one at a time")
+            for table_full_name, sql_content in batch:
+                if create_table(cursor, table_full_name, sql_content):
+                    created.append(table_full_name)
+    return created
+
 def parse_sql_columns(sql_file_path):
-    """Parse a CREATE TABLE SQL file to get column names and Snowflake types."""
+    """Parse a CREATE TABLE SQL file to get column names and Snowflake types.
+    
+    Column names are returned unquoted and uppercased, the form they take as
+    (uppercased) CSV headers.
+    """
     columns = {}
     try:
         with open(sql_file_path, 'r') as f:
             sql_content = f.read()
         
-        # Regex to find column definitions (handles quoted and unquoted names)
-        # Looks for lines like: `    COLUMN_NAME TYPE,` or `    "COLUMN NAME" TYPE,`
-        pattern = re.compile(r'^\s*("?([\w\s\-\/]+)"?)\s+([A-Z_]+(?:\(\d+\))?)[,\s]*$', re.MULTILINE | re.IGNORECASE)
-        matches = pattern.findall(sql_content)
+        # Find column definitions (handles quoted and unquoted names)
+        matches = _COLUMN_DEF_RE.findall(sql_content)
         
         for match in matches:
-            full_name, name_part, sf_type = match
-            # Store the identifier exactly as it appears in SQL (quoted or not)
+            quoted_name, unquoted_name, sf_type = match
+            # Store the identifier normalized once here (unquoted, uppercase)
             # and the general Snowflake type category
-            col_name_in_sql = full_name.strip()
+            col_name = (quoted_name or unquoted_name).upper()
+            sf_type = sf_type.upper()
             type_category = 'OTHER'
-            if 'NUMBER' in sf_type.upper() or 'INT' in sf_type.upper():
+            if 'NUMBER' in sf_type or 'INT' in sf_type:
                 type_category = 'NUMBER'
-            elif 'FLOAT' in sf_type.upper() or 'REAL' in sf_type.upper() or 'DOUBLE' in sf_type.upper():
+            elif 'FLOAT' in sf_type or 'REAL' in sf_type or 'DOUBLE' in sf_type:
                 type_category = 'FLOAT'
-            elif 'TIMESTAMP' in sf_type.upper() or 'DATE' in sf_type.upper() or 'TIME' in sf_type.upper():
+            elif 'TIMESTAMP' in sf_type or 'DATE' in sf_type or 'TIME' in sf_type:
                 type_category = 'TIMESTAMP'
                 
-            columns[col_name_in_sql] = type_category
+            columns[col_name] = type_category
             
     except Exception as e:
         logger.error(f"Error parsing SQL file {sql_file_path}: {e}")
     return columns
 
+def preprocess_chunk(df, table_full_name, col_types_for_table):
+    """Prepare a chunk of CSV rows (read as strings) for write_pandas."""
+    # --- Data Preprocessing --- 
+    df.columns = [col.upper() for col in df.columns] # Uppercase column names
+    
+    # Replace empty strings with None (becomes NULL in Snowflake) in numeric and
+    # timestamp columns, masking all of them in one pass; column names in the
+    # DataFrame are always uppercase
+    null_cols = [col_name for col_name, type_category in col_types_for_table.items()
+                 if type_category in NULLABLE_TYPE_CATEGORIES and col_name in df.columns]
+    if null_cols:
+        sub = df[null_cols]
+        df[null_cols] = sub.mask(sub.eq(''), None)
+    # --- End Data Preprocessing --- 
+    
+    # --- Handle special case for FINANCIAL_TABLE_ORDER column names ---
+    if table_full_name == 'FINANCIAL_TABLE_"ORDER"':
+        # Ensure columns match the manual definition (lowercase for write_pandas check)
+        df.columns = [col.lower() for col in df.columns] # Convert DF columns to lower for this table
+    # --- End special case --- 
+    return df
+
+def upload_with_write_pandas(conn, csv_path, table_full_name, col_types_for_table):
+    """Load a CSV file into an existing table through pandas and write_pandas.
+    
+    The file is read and uploaded in chunks of about WRITE_PANDAS_CHUNK_BYTES
+    of CSV input, so memory use does not grow with the file size. If a chunk
+    fails after earlier ones were loaded, the table is truncated so the next
+    run loads it again from scratch. Returns the number of rows loaded (0 if
+    the CSV has no rows); raises if the load fails.
+    """
+    # Size chunks from the average row size at the start of the file so each
+    # chunk is staged as one Parquet file of about WRITE_PANDAS_CHUNK_BYTES
+    with open(csv_path, 'rb') as f:
+        sample = f.read(1 << 20)
+    avg_row_bytes = max(1, len(sample) // max(1, sample.count(b'\n')))
+    rows_per_chunk = max(1, WRITE_PANDAS_CHUNK_BYTES // avg_row_bytes)
+    
+    total_rows = 0
+    try:
+        # Read CSV as string, one chunk at a time
+        with pd.read_csv(csv_path, dtype=str, keep_default_na=False, chunksize=rows_per_chunk) as reader:
+            for df in reader:
+                if len(df) == 0:
+                    continue
+                df = preprocess_chunk(df, table_full_name, col_types_for_table)
+                logger.info(f"Preparing to upload {len(df)} rows to {table_full_name}")
+                
+                success, nchunks, nrows, _ = write_pandas(
+                    conn=conn,
+                    df=df, # Use the preprocessed df
+                    table_name=table_full_name,
+                    chunk_size=rows_per_chunk,
+                    compression=WRITE_PANDAS_COMPRESSION,
+                    parallel=WRITE_PANDAS_PARALLEL,
+                    auto_create_table=False,  
+                    # Only empty tables are uploaded to, so appending is enough; overwrite=True
+                    # would recreate the table behind the scenes for the first chunk
+                    overwrite=False,
+                    quote_identifiers=False # Let Snowflake handle default casing
+                )
+                if not success:
+                    raise RuntimeError(f"write_pandas reported failure after {total_rows} rows")
+                total_rows += nrows
+    except Exception:
+        if total_rows:
+            # Don't leave a partially loaded table behind; it would be skipped as already loaded
+            logger.warning(f"Truncating partially loaded table {table_full_name}")
+            cursor = conn.cursor()
+            cursor.execute(f"TRUNCATE TABLE {table_full_name}")
+            cursor.close()
+        raise
+    return total_rows
+
+def copy_rows_loaded(cursor):
+    """Get the number of rows loaded by the COPY INTO just run on `cursor`.
+    
+    Each result row describes one loaded file; a COPY that processed no
+    files returns a single status row without a rows_loaded column.
+    """
+    columns = [col[0] for col in cursor.description]
+    if 'rows_loaded' not in columns:
+        return 0
+    rows_loaded_index = columns.index('rows_loaded')
+    return sum(row[rows_loaded_index] for row in cursor.fetchall())
+
+def upload_with_csv_stage(conn, csv_path, table_full_name, stage_dir):
+    """Load a CSV file into an existing table by staging the file itself.
+    
+    The exported CSV file is PUT to UPLOAD_STAGE under `stage_dir` (gzipped
+    by the connector on the way) and loaded with COPY INTO, matching columns
+    by position. Empty fields are loaded as NULL by the file format, so no
+    preprocessing is needed. Returns the number of rows loaded.
+    """
+    # Escape the local path the same way write_pandas does for PUT
+    put_path = os.path.abspath(csv_path).replace('\\', '\\\\').replace("'", "\\'")
+    stage_path = f"@{UPLOAD_STAGE}/{stage_dir}/".replace("'", "\\'")
+    staged_file_name = (os.path.basename(csv_path) + '.gz').replace("'", "''")
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"PUT 'file://{put_path}' '{stage_path}' "
+            f"AUTO_COMPRESS=TRUE SOURCE_COMPRESSION=NONE PARALLEL={PUT_PARALLEL} OVERWRITE=TRUE"
+        )
+        # The table is known to be empty here, so FORCE only guards against
+        # load metadata from earlier runs skipping the file
+        cursor.execute(
+            f"COPY INTO {table_full_name} FROM '{stage_path}' "
+            f"FILES = ('{staged_file_name}') "
+            f"FILE_FORMAT = (TYPE = CSV FIELD_OPTIONALLY_ENCLOSED_BY = '\"' SKIP_HEADER = 1 "
+            f"EMPTY_FIELD_AS_NULL = TRUE) "
+            f"ON_ERROR = ABORT_STATEMENT PURGE = TRUE FORCE = TRUE"
+        )
+        return copy_rows_loaded(cursor)
+
+def arrow_convert_options(header, col_types_for_table):
+    """Build pyarrow CSV convert options for an exported CSV file.
+    
+    Columns whose SQL type category is NUMBER, FLOAT or TIMESTAMP are parsed
+    as int64, float64 and timestamp values with empty fields read as NULL;
+    every other column (including all of them when `col_types_for_table` is
+    empty) is read as a string, keeping empty fields as empty strings.
+    """
+    arrow_types = {'NUMBER': pa.int64(), 'FLOAT': pa.float64(), 'TIMESTAMP': pa.timestamp('us')}
+    column_types = {name: arrow_types.get(col_types_for_table.get(name.upper())) or pa.string()
+                    for name in header}
+    return pa_csv.ConvertOptions(column_types=column_types, null_values=[''], strings_can_be_null=False)
+
+def upload_parquet_file(conn, parquet_path, table_full_name, stage_dir):
+    """Load a Parquet file into an existing table through UPLOAD_STAGE.
+    
+    The file is PUT to UPLOAD_STAGE under `stage_dir` and loaded with COPY
+    INTO, which matches Parquet columns to table columns by name. Returns the
+    number of rows loaded.
+    """
+    # Escape the local path the same way write_pandas does for PUT
+    put_path = os.path.abspath(parquet_path).replace('\\', '\\\\').replace("'", "\\'")
+    stage_path = f"@{UPLOAD_STAGE}/{stage_dir}/".replace("'", "\\'")
+    staged_file_name = os.path.basename(parquet_path).replace("'", "''")
+    with conn.cursor() as cursor:
+        cursor.execute(
+            f"PUT 'file://{put_path}' '{stage_path}' "
+            f"AUTO_COMPRESS=FALSE PARALLEL={PUT_PARALLEL} OVERWRITE=TRUE"
+        )
+        # The table is known to be empty here, so FORCE only guards against
+        # load metadata from earlier runs skipping the file
+        cursor.execute(
+            f"COPY INTO {table_full_name} FROM '{stage_path}' "
+            f"FILES = ('{staged_file_name}') "
+            f"FILE_FORMAT = (TYPE = PARQUET USE_LOGICAL_TYPE = TRUE) "
+            f"MATCH_BY_COLUMN_NAME = CASE_INSENSITIVE "
+            f"ON_ERROR = ABORT_STATEMENT PURGE = TRUE FORCE = TRUE"
+        )
+        return copy_rows_loaded(cursor)
+
+def upload_with_parquet_stage(conn, csv_path, table_full_name, col_types_for_table, stage_dir):
+    """Load a CSV file into an existing table by staging it as Parquet.
+    
+    The CSV file is converted to a Snappy-compressed Parquet file with pyarrow
+    and loaded with upload_parquet_file. Returns the number of rows loaded (0
+    if the CSV has no rows); raises if the load fails.
+    """
+    with open(csv_path, newline='') as f:
+        header = next(csv.reader(f), [])
+    read_options = pa_csv.ReadOptions(use_threads=True, block_size=CSV_READ_BLOCK_SIZE)
+    
+    # Parse numeric and timestamp columns natively; SQLite does not enforce
+    # declared types, so fall back to reading every column as a string and
+    # leave type conversion to COPY INTO if any value does not parse
+    try:
+        table = pa_csv.read_csv(csv_path, read_options=read_options,
+                                convert_options=arrow_convert_options(header, col_types_for_table))
+    except pa.ArrowInvalid as e:
+        logger.info(f"Reading {csv_path} with string columns, typed parsing failed: {e}")
+        table = pa_csv.read_csv(csv_path, read_options=read_options,
+                                convert_options=arrow_convert_options(header, {}))
+    if table.num_rows == 0:
+        return 0
+    
+    # Uppercase column names and load empty fields of numeric and timestamp
+    # columns that were read as strings as NULL
+    nullable_columns = {col_name for col_name, type_category in col_types_for_table.items()
+                        if type_category in NULLABLE_TYPE_CATEGORIES}
+    names = [name.upper() for name in table.column_names]
+    columns = []
+    for name, column in zip(names, table.columns):
+        if name in nullable_columns and pa.types.is_string(column.type):
+            column = pc.if_else(pc.equal(column, ''), pa.scalar(None, pa.string()), column)
+        columns.append(column)
+    table = pa.table(columns, names=names)
+    
+    logger.info(f"Preparing to upload {table.num_rows} rows to {table_full_name}")
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        parquet_path = os.path.join(tmp_dir, os.path.splitext(os.path.basename(csv_path))[0] + '.parquet')
+        pa_parquet.write_table(table, parquet_path, compression='snappy', use_dictionary=True, data_page_size=1 << 20)
+        del table
+        return upload_parquet_file(conn, parquet_path, table_full_name, stage_dir)
+
+def get_table_row_counts(cursor, database, schema):
+    """Get the row count of every table in the schema, keyed by table name.
+    
+    SHOW TABLES is answered from Snowflake's metadata without running a
+    warehouse query, and includes the row count of each table.
+    """
+    cursor.execute(f"SHOW TABLES IN SCHEMA {database}.{schema}")
+    columns = [col[0] for col in cursor.description]
+    name_index = columns.index('name')
+    rows_index = columns.index('rows')
+    return {row[name_index]: row[rows_index] or 0 for row in cursor.fetchall()}
+
+def create_upload_stage(conn):
+    """Create the session's temporary stage used by staged Parquet uploads."""
+    # Temporary stages are dropped automatically when the session ends
+    cursor = conn.cursor()
+    cursor.execute(f"CREATE TEMPORARY STAGE IF NOT EXISTS {UPLOAD_STAGE}")
+    cursor.close()
+
+def sso_token_cached(conn):
+    """Check whether new connections can reuse this connection's SSO login.
+    
+    Snowflake only returns an ID token for externalbrowser logins when the
+    account has ALLOW_ID_TOKEN enabled, and on macOS and Windows the connector
+    can only cache it in the OS keyring, which needs the
+    snowflake-connector-python[secure-local-storage] extra.
+    """
+    if not getattr(conn.rest, 'id_token', None):
+        return False
+    if sys.platform in ('darwin', 'win32'):
+        return importlib.util.find_spec('keyring') is not None
+    return True
+
+def upload_table_file(conn, upload_method, db_name, data_file, data_path, table_full_name, col_types_for_table):
+    """Upload one exported CSV or Parquet file into its existing, empty Snowflake table.
+    
+    Returns 'loaded', 'empty' (the file has no rows) or 'failed'.
+    """
+    try:
+        if data_path.endswith('.parquet'):
+            # Skip the PUT for empty tables, as is done for converted CSV files
+            if pa_parquet.read_metadata(data_path).num_rows == 0:
+                nrows = 0
+            else:
+                nrows = upload_parquet_file(conn, data_path, table_full_name, db_name)
+        elif upload_method == 'csv':
+            nrows = upload_with_csv_stage(conn, data_path, table_full_name, db_name)
+        elif upload_method == 'parquet':
+            nrows = upload_with_parquet_stage(conn, data_path, table_full_name, col_types_for_table, db_name)
+        else:
+            nrows = upload_with_write_pandas(conn, data_path, table_full_name, col_types_for_table)
+
+        if nrows == 0:
+            logger.warning(f"Data file {data_file} is empty after preprocessing, skipping")
+            return 'empty'
+        logger.info(f"Loaded {nrows} rows into {table_full_name}")
+        return 'loaded'
+    except Exception as e:
+        logger.error(f"Error loading data into {table_full_name}: {str(e)}")
+        # The traceback is only formatted when debug logging is enabled
+        logger.debug("Traceback for %s", table_full_name, exc_info=True)
+        return 'failed'
+
 def main():
-    """Create tables and upload data from CSV files to Snowflake."""
+    """Create tables and upload data from CSV or Parquet files to Snowflake."""
     try:
         # Check dependencies first
         if not check_dependencies():
@@ -236,6 +602,15 @@ def main():
         # Load environment variables
         load_dotenv()
         
+        upload_method = os.getenv('SNOWFLAKE_UPLOAD_METHOD', 'csv').lower()
+        if upload_method not in UPLOAD_METHODS:
+            logger.error(f"Unknown SNOWFLAKE_UPLOAD_METHOD '{upload_method}', expected one of: {', '.join(UPLOAD_METHODS)}")
+            sys.exit(1)
+        if upload_method == 'parquet' and pa is None:
+            logger.warning("pyarrow is not installed, falling back to write_pandas uploads")
+            upload_method = 'pandas'
+        logger.info(f"Upload method: {upload_method}")
+        
         # Get Snowflake connection parameters from environment
         account = os.getenv('SNOWFLAKE_ACCOUNT')
         user = os.getenv('SNOWFLAKE_USER')
@@ -248,80 +623,96 @@ def main():
         logger.info(f"Database: {database}, Schema: {schema}")
         
         # Connect to Snowflake with external browser authentication
-        conn = snowflake.connector.connect(
+        conn_params = dict(
             user=user,
             account=account,
             authenticator='externalbrowser',
             warehouse=warehouse,
             database=database,
             schema=schema,
-            role=role
+            role=role,
+            # Cache the SSO token so upload worker connections reuse this login
+            client_store_temporary_credential=True
         )
+        conn = snowflake.connector.connect(**conn_params)
         
         logger.info("Connected to Snowflake successfully")
         
         # Check if directories exist
         csv_dir = "output_csv"
+        parquet_dir = "output_parquet"
         sql_dir = "output_sql"
         
-        if not os.path.exists(csv_dir) or not os.path.exists(sql_dir):
-            logger.error(f"Required directories not found. Please ensure both exist: {csv_dir}, {sql_dir}")
+        # The parquet method loads the files written by `export_to_csv.py
+        # --format parquet` as they are, rather than converting the CSV export
+        if upload_method == 'parquet' and os.path.exists(parquet_dir):
+            data_dir, data_ext = parquet_dir, '.parquet'
+        else:
+            data_dir, data_ext = csv_dir, '.csv'
+        
+        if not os.path.exists(data_dir) or not os.path.exists(sql_dir):
+            logger.error(f"Required directories not found. Please ensure both exist: {data_dir}, {sql_dir}")
+            if os.path.exists(parquet_dir):
+                logger.info(f"To load {parquet_dir}, set SNOWFLAKE_UPLOAD_METHOD=parquet")
             sys.exit(1)
+        logger.info(f"Loading table data from {data_dir}")
         
-        # Get list of database directories from the CSV folder
-        databases = [d for d in os.listdir(csv_dir) 
-                    if os.path.isdir(os.path.join(csv_dir, d)) 
-                    and not d.startswith('.')]
+        # Get list of database directories from the data folder
+        # DirEntry caches the file type from the directory listing, avoiding a stat() per entry
+        with os.scandir(data_dir) as entries:
+            databases = [entry.name for entry in entries
+                         if entry.is_dir() and not entry.name.startswith('.')]
         
         if not databases:
-            logger.error(f"No database directories found in {csv_dir}")
+            logger.error(f"No database directories found in {data_dir}")
             sys.exit(1)
         
         logger.info(f"Found {len(databases)} databases to process")
         
         # Index SQL files by database name 
-        sql_files = [f for f in os.listdir(sql_dir) if f.endswith('.sql')]
+        with os.scandir(sql_dir) as entries:
+            sql_files = [entry.name for entry in entries if entry.is_file() and entry.name.endswith('.sql')]
         logger.info(f"Found {len(sql_files)} SQL files in {sql_dir}")
         
-        sql_files_by_db = {}
-        sql_column_types = {} # Store column types per table: { (db_name, table_name): {col: type} }
+        sql_files_by_db = {} # { db_name: [(sql_file, table_name, sql_path)] }
+        # Store column types per table: { (db_name.lower(), table_name.lower()): {col: type} },
+        # keyed case-insensitively so SQL and CSV file names always map to the same entry
+        sql_column_types = {}
+        # Try longer database names first so a file like financial_loans_x.sql
+        # matches financial_loans rather than financial
+        databases_by_length = sorted(databases, key=len, reverse=True)
         for sql_file in sql_files:
             matched = False
-            for db_name in databases:
+            for db_name in databases_by_length:
                 # Match filename format: db_name_table_name.sql
                 if sql_file.startswith(f"{db_name}_"):
-                    if db_name not in sql_files_by_db:
-                        sql_files_by_db[db_name] = []
-                    sql_files_by_db[db_name].append(sql_file)
-                    
                     # Parse columns and types from SQL file
                     table_name = sql_file[len(db_name)+1:].split('.')[0]
                     sql_path = os.path.join(sql_dir, sql_file)
-                    sql_column_types[(db_name, table_name)] = parse_sql_columns(sql_path)
+                    sql_files_by_db.setdefault(db_name, []).append((sql_file, table_name, sql_path))
+                    sql_column_types[(db_name.lower(), table_name.lower())] = parse_sql_columns(sql_path)
                     
                     matched = True
                     break
             if not matched:
                 logger.warning(f"Could not match SQL file {sql_file} to any database")
 
-        # Get existing tables from the schema to avoid duplicates
-        cursor = conn.cursor()
-        cursor.execute(f"SHOW TABLES IN SCHEMA {database}.{schema}")
-        existing_tables = [row[1] for row in cursor.fetchall()]
+        # One cursor runs all the DDL and metadata queries of the create phase
+        ddl_cursor = conn.cursor()
+        
+        # Get existing tables and their row counts from the schema with one
+        # metadata query, to avoid duplicate tables and duplicate uploads
+        existing_table_rows = get_table_row_counts(ddl_cursor, database, schema)
+        existing_tables = set(existing_table_rows)
         logger.info(f"Found {len(existing_tables)} existing tables in schema")
-        cursor.close()
         
         # Track overall statistics
-        total_tables_created = 0
-        total_tables_loaded = 0
-        total_tables_skipped = 0
+        tables_created_by_db = Counter()
+        upload_results_by_db = {db_name: Counter() for db_name in databases}
         failed_tables = []
         
-        # Track tables that need to be retried
-        tables_to_retry = []
-        
-        # Process each database directory
-        for db_name in tqdm(databases, desc="Processing databases"):
+        # Create tables for every database first, so uploads can run in parallel afterwards
+        for db_name in tqdm(databases, desc="Creating tables"):
             logger.info(f"Processing database: {db_name}")
             
             db_sql_files = sql_files_by_db.get(db_name, [])
@@ -329,21 +720,19 @@ def main():
                 logger.warning(f"No SQL files found for {db_name}, skipping table creation")
             else:
                 # Create tables for this database
-                cursor = conn.cursor()
-                tables_created = 0
-                for sql_file in db_sql_files:
-                    table_name = sql_file[len(db_name)+1:].split('.')[0]
-                    sql_path = os.path.join(sql_dir, sql_file)
+                pending_tables = [] # (table name, CREATE TABLE SQL) for tables that don't exist yet
+                for sql_file, table_name, sql_path in db_sql_files:
 
-                    # Determine the full table name based on SQL file content
-                    # Read the first line to get the table name potentially with quotes
+                    # Read the SQL once and determine the full table name (potentially
+                    # with quotes) from the CREATE statement at the start of the file
+                    sql_content = None
                     target_table_full_name = None
                     try:
                         with open(sql_path, 'r') as f:
-                            first_line = f.readline()
-                            match = re.search(r'CREATE OR REPLACE TABLE\s+([^\(]+)\(?', first_line, re.IGNORECASE)
-                            if match:
-                                target_table_full_name = match.group(1).strip()
+                            sql_content = f.read()
+                        match = _CREATE_TABLE_RE.search(sql_content, 0, CREATE_HEADER_SEARCH_CHARS)
+                        if match:
+                            target_table_full_name = match.group(1).strip()
                     except Exception as e_read:
                         logger.error(f"Could not read table name from {sql_path}: {e_read}")
 
@@ -361,138 +750,126 @@ def main():
                         logger.info(f"Table {target_table_full_name} already exists, skipping creation")
                         continue
                     
-                    try:
-                        # Read SQL content
-                        with open(sql_path, 'r') as f:
-                            sql_content = f.read()
-                        
-                        # Special handling for FINANCIAL_TABLE_ORDER - create directly
-                        if target_table_full_name == 'FINANCIAL_TABLE_"ORDER"':
-                            logger.info(f"Attempting to create special table {target_table_full_name} directly.")
-                            # Execute exactly the SQL read from the file
-                            cursor.execute(sql_content)
-                            tables_created += 1
-                            existing_tables.append(target_table_full_name) # Add the quoted name
-                            logger.info(f"Created table: {target_table_full_name}")
-                        # Use retry logic for other tables
-                        elif create_table_with_retry(cursor, sql_content, target_table_full_name):
-                            tables_created += 1
-                            existing_tables.append(target_table_full_name)
-                        else:
-                            failed_tables.append(f"{target_table_full_name} (creation)")
-                    except Exception as e:
-                        logger.error(f"Failed to create table {target_table_full_name}: {str(e)}")
+                    if sql_content is None:
                         failed_tables.append(f"{target_table_full_name} (creation)")
-                cursor.close()
+                    else:
+                        pending_tables.append((target_table_full_name, sql_content))
+                
+                created_tables = create_tables(ddl_cursor, pending_tables)
+                tables_created = len(created_tables)
+                existing_tables.update(created_tables)
+                # CREATE OR REPLACE leaves every created table empty
+                existing_table_rows.update((table_full_name.replace('"', ''), 0)
+                                           for table_full_name in created_tables)
+                # Pending tables did not exist before, so any still missing failed
+                failed_tables.extend(f"{target_table_full_name} (creation)"
+                                     for target_table_full_name, _ in pending_tables
+                                     if target_table_full_name not in existing_tables)
                 logger.info(f"Database {db_name}: Created {tables_created} tables")
+                tables_created_by_db[db_name] = tables_created
 
-            # Upload data for this database
-            db_csv_dir = os.path.join(csv_dir, db_name)
-            csv_files = [f for f in os.listdir(db_csv_dir) if f.endswith('.csv')] if os.path.exists(db_csv_dir) else []
+        conn.commit()
+        ddl_cursor.close()
+        
+        # Collect every data file to upload across all databases
+        upload_jobs = []
+        for db_name in databases:
+            db_data_dir = os.path.join(data_dir, db_name)
+            with os.scandir(db_data_dir) as entries:
+                data_files = [entry.name for entry in entries if entry.is_file() and entry.name.endswith(data_ext)]
+            if not data_files:
+                logger.warning(f"No {data_ext} files found for {db_name}, skipping data upload")
             
-            tables_loaded = 0
-            tables_skipped = 0
-            if not csv_files:
-                logger.warning(f"No CSV files found for {db_name}, skipping data upload")
-            else:
-                for csv_file in csv_files:
-                    table_name = os.path.splitext(csv_file)[0] # Original table name from CSV filename
-                    
-                    # --- Determine target table name (handle reserved keywords like ORDER) ---
-                    table_name_upper = table_name.upper()
-                    snowflake_table_name_part = f'"{table_name_upper}"' if needs_quoting(table_name_upper) else table_name_upper
-                    # Special case for ORDER table
-                    if table_name.lower() == 'order' and db_name.lower() == 'financial':
-                        snowflake_table_name_part = '"ORDER"' 
-                    table_full_name = f"{db_name.upper()}_TABLE_{snowflake_table_name_part}"
-                    # --- End target table name determination ---
-
-                    csv_path = os.path.join(db_csv_dir, csv_file)
-                    
+            db_name_lower = db_name.lower()
+            db_name_upper = db_name.upper()
+            for data_file in data_files:
+                table_name = os.path.splitext(data_file)[0] # Original table name from the data filename
+                
+                # --- Determine target table name (handle reserved keywords like ORDER) ---
+                table_name_upper = table_name.upper()
+                snowflake_table_name_part = f'"{table_name_upper}"' if needs_quoting(table_name_upper) else table_name_upper
+                # Special case for ORDER table
+                if table_name.lower() == 'order' and db_name_lower == 'financial':
+                    snowflake_table_name_part = '"ORDER"' 
+                table_full_name = f"{db_name_upper}_TABLE_{snowflake_table_name_part}"
+                # --- End target table name determination ---
+                
+                # Skip tables that already have data or were not created
+                row_count = existing_table_rows.get(table_full_name.replace('"', ''))
+                if row_count is None:
+                    logger.warning(f"Table {table_full_name} does not exist, skipping data upload. Check SQL creation.")
+                    upload_results_by_db[db_name]['missing'] += 1
+                    failed_tables.append(f"{table_full_name} (upload - table missing)")
+                    continue
+                elif row_count > 0:
+                    logger.info(f"Table {table_full_name} already has {row_count} rows, skipping data upload")
+                    upload_results_by_db[db_name]['skipped'] += 1
+                    continue
+                
+                # Get column types from parsed SQL 
+                col_types_for_table = sql_column_types.get((db_name_lower, table_name.lower()), {})
+                if not col_types_for_table:
+                    logger.warning(f"Could not find SQL column types for {db_name}.{table_name}, skipping preprocessing.")
+                
+                data_path = os.path.join(db_data_dir, data_file)
+                upload_jobs.append((db_name, data_file, data_path, table_full_name, col_types_for_table))
+        
+        # Upload tables concurrently, each worker on its own connection so PUT
+        # and COPY INTO traffic runs on separate sessions. Every login needs the
+        # SSO token cached by the main login, otherwise each one would open a
+        # browser window, so without it the main connection uploads alone
+        worker_count = min(UPLOAD_WORKERS, len(upload_jobs)) or 1
+        if worker_count > 1 and not sso_token_cached(conn):
+            logger.warning("SSO token caching is unavailable (see README), uploading one table at a time")
+            worker_count = 1
+        
+        # Open the extra connections one at a time, so each login finds the token
+        worker_conns = []
+        upload_conns = queue.Queue()
+        
+        def upload_job(db_name, data_file, data_path, table_full_name, col_types_for_table):
+            upload_conn = upload_conns.get()
+            try:
+                return upload_table_file(upload_conn, upload_method, db_name, data_file, data_path,
+                                         table_full_name, col_types_for_table)
+            finally:
+                upload_conns.put(upload_conn)
+        
+        try:
+            for _ in range(worker_count - 1):
+                try:
+                    worker_conns.append(snowflake.connector.connect(**conn_params))
+                except Exception as e:
+                    logger.warning(f"Could not open another upload connection, using {len(worker_conns) + 1}: {e}")
+                    break
+            for upload_conn in [conn, *worker_conns]:
+                if upload_method != 'pandas':
+                    create_upload_stage(upload_conn)
+                upload_conns.put(upload_conn)
+            
+            with ThreadPoolExecutor(max_workers=upload_conns.qsize()) as executor:
+                futures = {executor.submit(upload_job, *job): job for job in upload_jobs}
+                for future in tqdm(as_completed(futures), total=len(futures), desc="Uploading tables"):
+                    db_name, _, _, table_full_name, _ = futures[future]
                     try:
-                        # Check if table exists and has data
-                        table_exists, row_count = table_exists_and_has_data(conn, table_full_name)
-                        
-                        if table_exists and row_count > 0:
-                            logger.info(f"Table {table_full_name} already has {row_count} rows, skipping data upload")
-                            tables_skipped += 1
-                            continue
-                        elif not table_exists:
-                            logger.warning(f"Table {table_full_name} does not exist, skipping data upload. Check SQL creation.")
-                            failed_tables.append(f"{table_full_name} (upload - table missing)")
-                            continue
-
-                        # Read CSV as string
-                        df = pd.read_csv(csv_path, dtype=str, keep_default_na=False)
-                        # ... (error handling for read_csv remains the same) ...
-                        
-                        # --- Data Preprocessing --- 
-                        df.columns = [col.upper() for col in df.columns] # Uppercase column names
-                        
-                        # Get column types from parsed SQL 
-                        col_types_for_table = sql_column_types.get((db_name, table_name), {})
-                        if not col_types_for_table:
-                            logger.warning(f"Could not find SQL column types for {db_name}.{table_name}, skipping preprocessing.")
-                        else:
-                            for col_name_sql, type_category in col_types_for_table.items():
-                                # Column name in DataFrame is always uppercase
-                                col_name_df = col_name_sql.strip('"').upper()
-                                
-                                if col_name_df in df.columns:
-                                    if type_category in ['NUMBER', 'FLOAT', 'TIMESTAMP']:
-                                        # Replace empty strings with None (becomes NULL in Snowflake)
-                                        # Use np.nan for intermediate representation, then replace with None
-                                        df[col_name_df] = df[col_name_df].replace('', np.nan).where(pd.notna(df[col_name_df]), None)
-                        # --- End Data Preprocessing --- 
-
-                        if len(df) == 0:
-                            logger.warning(f"CSV file {csv_file} is empty after preprocessing, skipping")
-                            continue
-                        
-                        logger.info(f"Preparing to upload {len(df)} rows to {table_full_name}")
-                        
-                        # --- Handle special case for FINANCIAL_TABLE_ORDER column names ---
-                        final_df_columns = df.columns.tolist()
-                        if table_full_name == 'FINANCIAL_TABLE_"ORDER"':
-                            # Ensure columns match the manual definition (lowercase for write_pandas check)
-                            expected_cols_order = ['order_id', 'account_id', 'bank_to', 'account_to', 'amount', 'k_symbol']
-                            df.columns = [col.lower() for col in df.columns] # Convert DF columns to lower for this table
-                            final_df_columns = df.columns.tolist()
-                            logger.info(f"Adjusted columns for {table_full_name}: {final_df_columns}")
-                        # --- End special case --- 
-
-                        # Upload data
-                        # ... (write_pandas call and error handling remain similar) ...
-                        # Make sure to pass the potentially modified df
-                        success, nchunks, nrows, _ = write_pandas(
-                            conn=conn,
-                            df=df, # Use the preprocessed df
-                            table_name=table_full_name,
-                            auto_create_table=False,  
-                            overwrite=True, 
-                            quote_identifiers=False # Let Snowflake handle default casing
-                        )
-                        # ... (rest of try/except for write_pandas) ...
-
-                        if success:
-                            logger.info(f"Loaded {nrows} rows into {table_full_name}")
-                            tables_loaded += 1
-                        else:
-                            logger.error(f"Failed to load data into {table_full_name}")
-                            failed_tables.append(f"{table_full_name} (data upload)")
+                        result = future.result()
                     except Exception as e:
                         logger.error(f"Error loading data into {table_full_name}: {str(e)}")
-                        import traceback
-                        logger.error(traceback.format_exc())
+                        result = 'failed'
+                    upload_results_by_db[db_name][result] += 1
+                    if result == 'failed':
                         failed_tables.append(f"{table_full_name} (data upload)")
-            
-            logger.info(f"Database {db_name}: Created {tables_created} tables, Loaded data into {tables_loaded} tables, Skipped {tables_skipped} tables with existing data")
-            total_tables_created += tables_created
-            total_tables_loaded += tables_loaded
-            total_tables_skipped += tables_skipped
-            
-            # Commit changes for this database
-            conn.commit()
+        finally:
+            for worker_conn in worker_conns:
+                worker_conn.close()
+        
+        for db_name in databases:
+            results = upload_results_by_db[db_name]
+            logger.info(f"Database {db_name}: Created {tables_created_by_db[db_name]} tables, Loaded data into {results['loaded']} tables, Skipped {results['skipped']} tables with existing data")
+        
+        total_tables_created = sum(tables_created_by_db.values())
+        total_tables_loaded = sum(results['loaded'] for results in upload_results_by_db.values())
+        total_tables_skipped = sum(results['skipped'] for results in upload_results_by_db.values())
         
         logger.info(f"Complete! Created {total_tables_created} tables, Loaded data into {total_tables_loaded} tables, Skipped {total_tables_skipped} tables with existing data")
         
@@ -504,9 +881,7 @@ def main():
         logger.info("Snowflake connection closed")
         
     except Exception as e:
-        logger.error(f"Error: {str(e)}")
-        import traceback
-        logger.error(traceback.format_exc())
+        logger.error(f"Error: {str(e)}", exc_info=True)
         sys.exit(1)
 
 if __name__ == "__main__":
@@ -7,26 +7,35 @@ It shows the number of tables uploaded and allows you to query the tables.
 """
 
 import os
-import pandas as pd
-import snowflake.connector
+import argparse
+import contextlib
+import hashlib
+import importlib.util
+import json
+import time
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 import logging
 import sys
 
-# Set up logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
 logger = logging.getLogger(__name__)
 
-def get_snowflake_connection():
-    """Create a connection to Snowflake."""
-    try:
-        conn = snowflake.connector.connect(
+@dataclass(frozen=True)
+class SFConfig:
+    """Snowflake connection settings, read once from the environment."""
+    user: str
+    account: str
+    authenticator: str
+    warehouse: str
+    database: str
+    schema: str
+    role: str
+    
+    @classmethod
+    def from_env(cls):
+        """Build the configuration from SNOWFLAKE_* environment variables."""
+        return cls(
             user=os.getenv('SNOWFLAKE_USER'),
             account=os.getenv('SNOWFLAKE_ACCOUNT'),
             authenticator=os.getenv('SNOWFLAKE_AUTH_TYPE'),
@@ -35,125 +44,366 @@ def get_snowflake_connection():
             schema=os.getenv('SNOWFLAKE_SCHEMA'),
             role=os.getenv('SNOWFLAKE_ROLE')
         )
+
+# Number of rows shown when sampling a table
+SAMPLE_LIMIT = 5
+# Smallest cursor arraysize used for sample queries
+SAMPLE_MIN_ARRAYSIZE = 1000
+# Number of connections fetching table samples in the background
+SAMPLE_PREFETCH_WORKERS = 8
+# Seconds to wait for a free pooled connection
+POOL_TIMEOUT = 120
+# Where table lists are cached between runs, and for how many seconds
+TABLE_LIST_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.cache', 'verify_snowflake')
+TABLE_LIST_CACHE_TTL = 300
+# Seconds between status checks while waiting for an async query
+QUERY_POLL_INTERVAL = 0.2
+
+def get_snowflake_connection(config):
+    """Create a connection to Snowflake."""
+    # Imported here so importing this module stays cheap
+    import snowflake.connector
+    
+    try:
+        conn = snowflake.connector.connect(
+            user=config.user,
+            account=config.account,
+            authenticator=config.authenticator,
+            warehouse=config.warehouse,
+            database=config.database,
+            schema=config.schema,
+            role=config.role,
+            # Cache SSO tokens so the sample prefetch connections reuse this login
+            client_store_temporary_credential=True,
+            # Keep the session alive while the interactive prompt sits idle,
+            # so the next query doesn't have to log in again
+            client_session_keep_alive=True,
+            client_session_keep_alive_heartbeat_frequency=900
+        )
         logger.info("Connected to Snowflake successfully.")
         return conn
     except Exception as e:
         logger.error(f"Failed to connect to Snowflake: {e}")
         raise
 
-def get_table_count(conn):
-    """Get the number of tables in the schema."""
-    cursor = conn.cursor()
-    database = os.getenv('SNOWFLAKE_DATABASE')
-    schema = os.getenv('SNOWFLAKE_SCHEMA')
+def create_connection_pool(config, pool_size):
+    """Create a pool of up to `pool_size` Snowflake connections.
     
-    query = f"""
-    SELECT COUNT(*) 
-    FROM {database}.INFORMATION_SCHEMA.TABLES 
-    WHERE TABLE_SCHEMA = '{schema}'
+    Connections are opened on first use and handed back to the pool when
+    closed, so each login is reused instead of repeated per task.
     """
+    # Imported here so importing this module stays cheap
+    from sqlalchemy.pool import QueuePool
     
-    cursor.execute(query)
-    count = cursor.fetchone()[0]
-    cursor.close()
+    return QueuePool(
+        lambda: get_snowflake_connection(config),
+        pool_size=pool_size,
+        max_overflow=0,
+        recycle=-1,
+        timeout=POOL_TIMEOUT,
+        # Only SELECT and SHOW queries run in autocommit mode, so there is
+        # nothing to roll back; skip the round trip on every checkin
+        reset_on_return=None
+    )
+
+@contextlib.contextmanager
+def get_connection(pool):
+    """Borrow a connection from the pool, returning it when the block exits."""
+    conn = pool.connect()
+    try:
+        yield conn
+    finally:
+        conn.close()
+
+def open_pooled_connections(pool, count):
+    """Open `count` connections one at a time ahead of their first use; they stay in the pool."""
+    with contextlib.ExitStack() as stack:
+        for _ in range(count):
+            stack.enter_context(get_connection(pool))
+
+def login_needs_browser(config, conn):
+    """Check whether opening another connection would open a browser window.
     
-    return count
+    Externalbrowser (SSO) logins only skip the browser when the first login
+    cached an ID token, which needs ALLOW_ID_TOKEN on the account and, on
+    macOS and Windows, the secure-local-storage extra (see README).
+    """
+    if (config.authenticator or '').lower() != 'externalbrowser':
+        return False
+    if not getattr(conn.dbapi_connection.rest, 'id_token', None):
+        return True
+    if sys.platform in ('darwin', 'win32'):
+        return importlib.util.find_spec('keyring') is None
+    return False
 
-def get_table_list(conn):
-    """Get a list of all tables in the schema."""
-    cursor = conn.cursor()
-    database = os.getenv('SNOWFLAKE_DATABASE')
-    schema = os.getenv('SNOWFLAKE_SCHEMA')
-    
-    query = f"""
-    SELECT TABLE_NAME, ROW_COUNT
-    FROM {database}.INFORMATION_SCHEMA.TABLES 
-    WHERE TABLE_SCHEMA = '{schema}'
-    ORDER BY TABLE_NAME
+def wait_for_query(conn, cursor, query_id):
+    """Wait for a query submitted with execute_async and load its results into `cursor`."""
+    while conn.is_still_running(conn.get_query_status_throw_if_error(query_id)):
+        time.sleep(QUERY_POLL_INTERVAL)
+    cursor.get_results_from_sfqid(query_id)
+
+def start_table_list(cursor, config):
+    """Submit the query listing all tables in the schema, returning its query ID.
+    
+    SHOW TABLES is answered from Snowflake's metadata without running a
+    warehouse query, and returns each table's row count along with its name.
     """
+    cursor.execute_async(f"SHOW TABLES IN SCHEMA {config.database}.{config.schema}")
+    return cursor.sfqid
+
+def get_table_list(conn, cursor, query_id):
+    """Get a list of (table name, row count) from a start_table_list query."""
+    wait_for_query(conn, cursor, query_id)
+    columns = [col[0] for col in cursor.description]
+    name_index = columns.index('name')
+    rows_index = columns.index('rows')
+    return [(row[name_index], row[rows_index]) for row in cursor.fetchall()]
+
+def table_list_cache_path(config):
+    """Get the path of the on-disk table list cache for this account and schema."""
+    key = '\0'.join(str(value) for value in (config.account, config.database, config.schema, config.role))
+    return os.path.join(TABLE_LIST_CACHE_DIR, hashlib.sha256(key.encode()).hexdigest() + '.json')
+
+def load_cached_table_list(cache_path):
+    """Load a cached table list, or return None if it is missing, stale or unreadable."""
+    try:
+        if time.time() - os.path.getmtime(cache_path) > TABLE_LIST_CACHE_TTL:
+            return None
+        with open(cache_path, 'r') as f:
+            cached = json.load(f)
+        return [tuple(table) for table in cached['tables']]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+def save_table_list(cache_path, tables):
+    """Cache a table list on disk for later runs."""
+    try:
+        os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        # Write to a temporary file first so readers never see a partial list
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({'tables': tables}, f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        logger.warning(f"Could not cache table list: {e}")
+
+def quote_identifier(name):
+    """Quote a Snowflake identifier exactly as it is stored."""
+    return '"{}"'.format(name.replace('"', '""'))
+
+def sample_query(config, table_name):
+    """Build the query selecting the first rows of a table (limit bound as %s).
     
-    cursor.execute(query)
-    tables = cursor.fetchall()
-    cursor.close()
+    Identifiers can't be bound as query parameters, so `table_name` must be
+    one of the names returned by get_table_list.
+    """
+    quoted_table_name = quote_identifier(table_name)
     
-    return tables
+    return f"""
+    SELECT *
+    FROM {config.database}.{config.schema}.{quoted_table_name}
+    LIMIT %s
+    """
 
-def get_table_sample(conn, table_name, limit=5):
-    """Get a sample of rows from a table."""
-    cursor = conn.cursor()
-    database = os.getenv('SNOWFLAKE_DATABASE')
-    schema = os.getenv('SNOWFLAKE_SCHEMA')
+def read_sample(cursor):
+    """Read the column names and rows of a sample query's result.
     
-    query = f"""
-    SELECT * 
-    FROM {database}.{schema}.{table_name}
-    LIMIT {limit}
+    The column names come from the result description, so they are always
+    in table order and up to date with the table.
     """
+    columns = [col[0] for col in cursor.description]
+    return columns, cursor.fetchall()
+
+def fetch_table_sample(cursor, config, table_name, limit):
+    """Fetch the column names and first `limit` rows of a table."""
+    cursor.arraysize = max(limit, SAMPLE_MIN_ARRAYSIZE)
+    cursor.execute(sample_query(config, table_name), (limit,))
+    return read_sample(cursor)
+
+def get_table_sample(sample_futures, table_name):
+    """Get a sample of rows from a table, waiting for its prefetch to finish."""
+    future = sample_futures.get(table_name)
+    if future is None:
+        logger.error(f"Unknown table {table_name}")
+        return None, None
     
     try:
-        cursor.execute(query)
-        columns = [col[0] for col in cursor.description]
-        rows = cursor.fetchall()
-        cursor.close()
-        
-        return columns, rows
+        return future.result()
     except Exception as e:
         logger.error(f"Error querying table {table_name}: {e}")
-        cursor.close()
         return None, None
 
+def print_table(columns, rows):
+    """Print rows as right-aligned, space-separated columns under a header.
+    
+    Column widths are found in one pass over the formatted cells, then each
+    line is written to stdout as it is built.
+    """
+    header = [str(col) for col in columns]
+    cells = [[str(value) for value in row] for row in rows]
+    widths = [len(name) for name in header]
+    for row in cells:
+        widths = [max(width, len(cell)) for width, cell in zip(widths, row)]
+    
+    write = sys.stdout.write
+    for row in [header] + cells:
+        write(' '.join(cell.rjust(width) for cell, width in zip(row, widths)) + '\n')
+
+def scan_all_tables(conn, config, tables, limit):
+    """Print a sample of every table.
+    
+    All sample queries are submitted with execute_async before any result is
+    read, so Snowflake runs them concurrently for this one connection.
+    """
+    cursor = conn.cursor()
+    cursor.arraysize = max(limit, SAMPLE_MIN_ARRAYSIZE)
+    query_ids = {}
+    for table_name, _ in tables:
+        cursor.execute_async(sample_query(config, table_name), (limit,))
+        query_ids[table_name] = cursor.sfqid
+    
+    for table_name, query_id in query_ids.items():
+        try:
+            wait_for_query(conn, cursor, query_id)
+            columns, rows = read_sample(cursor)
+        except Exception as e:
+            logger.error(f"Error querying table {table_name}: {e}")
+            continue
+        
+        if rows:
+            print(f"\n{table_name}:")
+            print_table(columns, rows)
+        else:
+            logger.warning(f"No data available for {table_name}")
+    cursor.close()
+
+def explore_tables(pool, executor, config, tables):
+    """Interactively show sample data for tables picked from the list."""
+    # Fetch samples of every table in the background, in list order, so
+    # most are ready by the time they are picked. Cursors shouldn't be
+    # shared across threads, so each sample borrows its own pooled connection
+    def sample_job(table_name):
+        with get_connection(pool) as conn:
+            cursor = conn.cursor()
+            try:
+                return fetch_table_sample(cursor, config, table_name, SAMPLE_LIMIT)
+            finally:
+                cursor.close()
+    
+    sample_futures = {table_name: executor.submit(sample_job, table_name) for table_name, _ in tables}
+    
+    try:
+        while True:
+            try:
+                choice = input("\nEnter a table number to view sample data (or 'q' to quit): ").strip()
+                
+                if choice in ('q', 'Q'):
+                    break
+                
+                try:
+                    table_idx = int(choice) - 1
+                except ValueError:
+                    table_idx = -1
+                
+                if 0 <= table_idx < len(tables):
+                    table_name = tables[table_idx][0]
+                    
+                    logger.info(f"Fetching sample data from {table_name}...")
+                    columns, rows = get_table_sample(sample_futures, table_name)
+                    
+                    if columns and rows:
+                        print("\nSample data:")
+                        print_table(columns, rows)
+                    else:
+                        logger.warning(f"No data available for {table_name}")
+                else:
+                    logger.warning("Invalid choice. Please enter a valid table number.")
+            except (KeyboardInterrupt, EOFError):
+                break
+            except Exception as e:
+                logger.error(f"Error: {e}")
+    finally:
+        # Drop samples that haven't started yet
+        for future in sample_futures.values():
+            future.cancel()
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="Verify BIRD tables uploaded to Snowflake.")
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Print a sample of every table and exit instead of prompting for tables"
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help=f"List tables from Snowflake even if a cached list is less than {TABLE_LIST_CACHE_TTL} seconds old"
+    )
+    return parser.parse_args()
+
 def main():
     """Main function to verify Snowflake tables."""
-    # Load environment variables
+    args = parse_args()
+    
+    # Load environment variables once, so the settings are resolved at startup
+    # rather than on every query
     load_dotenv()
+    config = SFConfig.from_env()
     
     try:
-        # Connect to Snowflake
-        conn = get_snowflake_connection()
+        # Connect to Snowflake; the pool also serves the background sample fetches
+        pool = create_connection_pool(config, SAMPLE_PREFETCH_WORKERS + 1)
+        conn = pool.connect()
+        # This cursor only runs the SHOW TABLES listing; samples run on their
+        # own cursors and pooled connections
+        cursor = conn.cursor()
         
-        # Get table count
-        table_count = get_table_count(conn)
-        logger.info(f"Total tables in schema: {table_count}")
+        # Reuse a recent table list from disk, or list tables with an async
+        # query. While Snowflake runs it, open the pooled connections used by
+        # the background sample fetches, one at a time so each login reuses
+        # the first one's cached SSO token
+        cache_path = table_list_cache_path(config)
+        tables = None if args.refresh else load_cached_table_list(cache_path)
+        if tables is None:
+            query_id = start_table_list(cursor, config)
+        else:
+            logger.info(f"Using table list cached at {cache_path} (pass --refresh to list tables again)")
+        executor = None
+        if not args.all:
+            if login_needs_browser(config, conn):
+                # Every new connection would open a browser window, so fetch
+                # samples on this connection alone once the table list is in
+                logger.warning("SSO token caching is unavailable (see README), fetching samples one at a time")
+                executor = ThreadPoolExecutor(max_workers=1)
+            else:
+                executor = ThreadPoolExecutor(max_workers=SAMPLE_PREFETCH_WORKERS)
+                executor.submit(open_pooled_connections, pool, SAMPLE_PREFETCH_WORKERS)
         
-        # Get table list
-        tables = get_table_list(conn)
+        # Get table list; the table count comes from the same query
+        if tables is None:
+            tables = get_table_list(conn, cursor, query_id)
+            save_table_list(cache_path, tables)
+        logger.info(f"Total tables in schema: {len(tables)}")
         logger.info("Table list:")
         for i, (table_name, row_count) in enumerate(tables):
             logger.info(f"{i+1}. {table_name}: {row_count} rows")
         
-        # Interactive mode to explore tables
-        if tables:
-            while True:
-                try:
-                    print("\nEnter a table number to view sample data (or 'q' to quit): ", end="")
-                    choice = input().strip()
-                    
-                    if choice.lower() == 'q':
-                        break
-                    
-                    if choice.isdigit() and 1 <= int(choice) <= len(tables):
-                        table_idx = int(choice) - 1
-                        table_name = tables[table_idx][0]
-                        
-                        logger.info(f"Fetching sample data from {table_name}...")
-                        columns, rows = get_table_sample(conn, table_name)
-                        
-                        if columns and rows:
-                            # Create a pandas DataFrame for pretty printing
-                            df = pd.DataFrame(rows, columns=columns)
-                            print("\nSample data:")
-                            print(df.to_string(index=False))
-                        else:
-                            logger.warning(f"No data available for {table_name}")
-                    else:
-                        logger.warning("Invalid choice. Please enter a valid table number.")
-                except KeyboardInterrupt:
-                    break
-                except Exception as e:
-                    logger.error(f"Error: {e}")
-        
-        # Close Snowflake connection
+        cursor.close()
+        if tables and args.all:
+            scan_all_tables(conn, config, tables, SAMPLE_LIMIT)
+        # Hand the connection back to the pool for the background sample fetches
         conn.close()
+        
+        if executor is not None:
+            if tables:
+                # Interactive mode to explore tables
+                explore_tables(pool, executor, config, tables)
+            # Wait for samples that are still being fetched
+            executor.shutdown()
+        
+        # Close Snowflake connections
+        pool.dispose()
         logger.info("Snowflake connection closed.")
         
     except Exception as e:
@@ -161,4 +411,12 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    # Set up logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
+        handlers=[
+            logging.StreamHandler(sys.stdout)
+        ]
+    )
+    main()